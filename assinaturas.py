@@ -0,0 +1,44 @@
+"""
+Assinaturas (hashes estáveis) de genomas e arquivos.
+
+hash_genoma resume a estrutura que define a rede (nós com
+bias/response/ativação/agregação e conexões habilitadas com pesos),
+ignorando genome.key; hash_arquivo resume o conteúdo de um arquivo (ex.:
+os genomas dos adversários). Mesmo valor em qualquer processo/máquina:
+semeiam os trials da avaliação (pong_neat.semente_trial) e formam a
+chave do cache de fitness (cache_fitness).
+"""
+import os
+import hashlib
+from typing import Optional
+
+
+def hash_genoma(genome) -> bytes:
+    """Hash estrutural: ignora genome.key, conexões desabilitadas e ordem."""
+    h = hashlib.blake2b(digest_size=16)
+    for k in sorted(genome.nodes):
+        ng = genome.nodes[k]
+        h.update(f"n{k}:{ng.bias!r}:{ng.response!r}:{ng.activation}:{ng.aggregation};".encode())
+    for k in sorted(genome.connections):
+        cg = genome.connections[k]
+        if cg.enabled:
+            h.update(f"c{k[0]},{k[1]}:{cg.weight!r};".encode())
+    return h.digest()
+
+
+# arquivo -> (mtime_ns, hash do conteúdo)
+_HASH_ARQUIVOS = {}
+
+
+def hash_arquivo(caminho: str) -> Optional[str]:
+    """Hash do conteúdo do arquivo (None se não existir); recalcula só se mudar."""
+    if not os.path.exists(caminho):
+        return None
+    mtime = os.stat(caminho).st_mtime_ns
+    em_cache = _HASH_ARQUIVOS.get(caminho)
+    if em_cache is not None and em_cache[0] == mtime:
+        return em_cache[1]
+    with open(caminho, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    _HASH_ARQUIVOS[caminho] = (mtime, digest)
+    return digest
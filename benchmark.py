@@ -0,0 +1,296 @@
+"""
+Benchmarks headless do Pong + NEAT.
+
+Mede, sem janela:
+  - passos/s de JogoPongSim.step com dois controladores heurísticos
+  - passos/s de lote.BatchPong (partidas por passo × passos/s)
+  - ativações/s de FeedForwardNetwork e RedeCompilada em redes crescentes
+  - genomas/s de avaliar_genoma
+  - segundos por geração: func_avaliacao (sequencial), lote,
+    neat.ParallelEvaluator e AvaliadorPersistente com 1..N workers
+
+Uso:
+    python benchmark.py                          # imprime e salva benchmark.json
+    python benchmark.py --saida base.json        # guarda uma referência
+    python benchmark.py --comparar base.json     # acusa regressões (código 1)
+    python benchmark.py --rapido --workers 2
+
+Cada medida é o melhor de algumas repetições (menos ruído do SO).
+"""
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import platform
+import multiprocessing
+from datetime import datetime
+
+# sem janela: o pygame usa o driver de vídeo "dummy"
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import neat
+
+import lote
+import pong_neat
+from paralelo import AvaliadorPersistente
+from redes import RedeCompilada
+from simulacao import FPS, JogoPongSim
+
+CAMINHO_CONFIG = os.path.join(os.path.dirname(__file__), "config-neat.txt")
+
+
+# ==========================
+# AUXILIARES
+# ==========================
+def _carregar_config():
+    return neat.config.Config(neat.DefaultGenome,
+                              neat.DefaultReproduction,
+                              neat.DefaultSpeciesSet,
+                              neat.DefaultStagnation,
+                              CAMINHO_CONFIG)
+
+
+def _melhor_tempo(funcao, repeticoes: int) -> float:
+    """Menor tempo (s) de `repeticoes` chamadas de funcao()."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _populacao(config, n: int, semente: int = 0):
+    """n genomas iniciais com algumas mutações, sempre os mesmos."""
+    random.seed(semente)
+    genomas = []
+    for k in range(1, n + 1):
+        g = config.genome_type(k)
+        g.configure_new(config.genome_config)
+        for _ in range(5):
+            g.mutate(config.genome_config)
+        genomas.append((k, g))
+    return genomas
+
+
+def _genoma_com_ocultos(config, ocultos: int, semente: int = 0):
+    """Genoma com `ocultos` nós ocultos (divisões de conexões)."""
+    random.seed(semente)
+    g = config.genome_type(0)
+    g.configure_new(config.genome_config)
+    while len(g.nodes) - config.genome_config.num_outputs < ocultos:
+        g.mutate_add_node(config.genome_config)
+        g.mutate_add_connection(config.genome_config)
+    return g
+
+
+def _iniciar_tela_headless():
+    # func_avaliacao desenha a barra de progresso em TELA
+    import pygame
+    pygame.init()
+    pong_neat.TELA = pygame.display.set_mode((pong_neat.LARGURA, pong_neat.ALTURA))
+    pong_neat.FONTE_M = pygame.font.SysFont("arial", 26)
+    pong_neat.FONTE_P = pygame.font.SysFont("arial", 20)
+
+
+# ==========================
+# MEDIDAS
+# ==========================
+def bench_simulacao(passos: int, repeticoes: int) -> dict:
+    def _rodar():
+        jogo = JogoPongSim(random.Random(0))
+        ctrl_esq = pong_neat.ctrl_ai_heuristico(0.22, 10, "esq", random.Random(1))
+        ctrl_dir = pong_neat.ctrl_ai_heuristico(0.22, 10, "dir", random.Random(2))
+        dt = 1.0 / FPS
+        for _ in range(passos):
+            jogo.step(dt, ctrl_esq, ctrl_dir)
+    return {"sim_passos_por_s": passos / _melhor_tempo(_rodar, repeticoes)}
+
+
+def bench_lote(partidas: int, passos: int, repeticoes: int) -> dict:
+    def _rodar():
+        jogo = lote.BatchPong(partidas, rng=np.random.default_rng(0))
+        heur = lote.HeuristicoLote(np.full(partidas, 0.22), np.full(partidas, 10.0),
+                                   np.random.default_rng(1))
+        lado_dir = np.zeros(partidas, dtype=bool)
+        dt = 1.0 / FPS
+        for _ in range(passos):
+            estado = jogo.estado()
+            acao = heur.acoes(estado, lado_dir)
+            jogo.step(dt, acao, -acao)
+    return {"lote_passos_por_s": partidas * passos / _melhor_tempo(_rodar, repeticoes)}
+
+
+def bench_inferencia(config, tamanhos, ativacoes: int, repeticoes: int) -> dict:
+    resultados = {}
+    rng = random.Random(0)
+    entradas = [[rng.uniform(-1, 1) for _ in range(8)] for _ in range(256)]
+    for ocultos in tamanhos:
+        g = _genoma_com_ocultos(config, ocultos)
+        for nome, rede in (("ffn", neat.nn.FeedForwardNetwork.create(g, config)),
+                           ("compilada", RedeCompilada.create(g, config))):
+            def _rodar():
+                ativar = rede.activate
+                for i in range(ativacoes):
+                    ativar(entradas[i & 255])
+            resultados[f"inferencia_{nome}_{ocultos}_ocultos_por_s"] = \
+                ativacoes / _melhor_tempo(_rodar, repeticoes)
+    return resultados
+
+
+def bench_avaliar_genoma(config, n: int, repeticoes: int) -> dict:
+    genomas = [g for _, g in _populacao(config, n)]
+
+    def _rodar():
+        for g in genomas:
+            pong_neat.avaliar_genoma(g, config)
+    return {"avaliar_genoma_por_s": n / _melhor_tempo(_rodar, repeticoes)}
+
+
+def bench_geracao(config, n: int, max_workers: int, repeticoes: int) -> dict:
+    """Segundos para avaliar uma geração de n genomas em cada modo."""
+    genomas = _populacao(config, n)
+    resultados = {}
+
+    _iniciar_tela_headless()
+    resultados["geracao_sequencial_s"] = _melhor_tempo(
+        lambda: pong_neat.func_avaliacao(genomas, config), repeticoes)
+    resultados["geracao_lote_s"] = _melhor_tempo(
+        lambda: pong_neat.func_avaliacao_lote(genomas, config), repeticoes)
+
+    for w in range(1, max_workers + 1):
+        avaliador = neat.ParallelEvaluator(w, pong_neat.parallel_wrapper)
+        try:
+            resultados[f"geracao_parallel_evaluator_{w}w_s"] = _melhor_tempo(
+                lambda: avaliador.evaluate(genomas, config), repeticoes)
+        finally:
+            avaliador.pool.close()
+            avaliador.pool.join()
+
+        with AvaliadorPersistente(w, pong_neat.parallel_wrapper) as avaliador:
+            avaliador.publicar(config, preparar=pong_neat.receber_adversarios,
+                               extra=pong_neat._pacote_adversarios(config))
+            resultados[f"geracao_persistente_{w}w_s"] = _melhor_tempo(
+                lambda: avaliador.evaluate(genomas, config), repeticoes)
+    return resultados
+
+
+def info_maquina() -> dict:
+    return {
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": multiprocessing.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "neat": getattr(neat, "__version__", "?"),
+    }
+
+
+def rodar(rapido=False, max_workers=None) -> dict:
+    config = _carregar_config()
+    rep = 2 if rapido else 3
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+
+    resultados = {}
+    print("⏱ Simulação...")
+    resultados.update(bench_simulacao(5_000 if rapido else 30_000, rep))
+    print("⏱ Simulação em lote...")
+    resultados.update(bench_lote(600, 100 if rapido else 300, rep))
+    print("⏱ Inferência...")
+    resultados.update(bench_inferencia(config, (0, 4, 16) if rapido else (0, 4, 16, 64),
+                                       5_000 if rapido else 30_000, rep))
+    print("⏱ avaliar_genoma...")
+    resultados.update(bench_avaliar_genoma(config, 10 if rapido else 40, rep))
+    print("⏱ Gerações...")
+    resultados.update(bench_geracao(config, 30 if rapido else config.pop_size, max_workers,
+                                    1 if rapido else 2))
+
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "maquina": info_maquina(),
+        "rapido": rapido,
+        "resultados": resultados,
+    }
+
+
+# ==========================
+# COMPARAÇÃO
+# ==========================
+def maior_melhor(nome: str) -> bool:
+    # vazões (_por_s) sobem quando melhora; tempos (_s) descem
+    return nome.endswith("_por_s")
+
+
+def comparar(atual: dict, base: dict, tolerancia: float = 0.10) -> list:
+    """
+    Retorna [(nome, base, atual, variação)] das métricas que pioraram
+    mais que `tolerancia` (fração) em relação à referência.
+    Métricas ausentes em um dos lados são ignoradas.
+    """
+    regressoes = []
+    for nome, valor in atual["resultados"].items():
+        ref = base["resultados"].get(nome)
+        if not ref:
+            continue
+        variacao = valor / ref - 1.0
+        piorou = -variacao if maior_melhor(nome) else variacao
+        if piorou > tolerancia:
+            regressoes.append((nome, ref, valor, variacao))
+    return regressoes
+
+
+def imprimir(relatorio: dict, base: dict = None):
+    m = relatorio["maquina"]
+    print(f"\n{'='*60}")
+    print(f"BENCHMARK  {relatorio['data']}  ({m['cpus']} CPUs, Python {m['python']})")
+    print(f"{'='*60}")
+    for nome, valor in relatorio["resultados"].items():
+        linha = f"{nome:<45} {valor:>14.3f}" if nome.endswith("_s") and not maior_melhor(nome) \
+            else f"{nome:<45} {valor:>14.0f}"
+        if base is not None and base["resultados"].get(nome):
+            linha += f"   ({100 * (valor / base['resultados'][nome] - 1):+.1f}%)"
+        print(linha)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks headless do Pong + NEAT")
+    parser.add_argument("--saida", default="benchmark.json", help="arquivo JSON de resultados")
+    parser.add_argument("--comparar", metavar="BASE", help="JSON de referência para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="piora relativa tolerada na comparação (padrão 0.10)")
+    parser.add_argument("--rapido", action="store_true", help="medidas menores (para testar)")
+    parser.add_argument("--workers", type=int, default=None, help="máximo de workers (padrão: nº de CPUs)")
+    args = parser.parse_args(argv)
+
+    relatorio = rodar(args.rapido, args.workers)
+
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+    imprimir(relatorio, base)
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Resultados salvos em {args.saida}")
+
+    if base is not None:
+        if base.get("maquina") != relatorio["maquina"]:
+            print("⚠ Referência gerada em outra máquina/ambiente: compare com cuidado")
+        regressoes = comparar(relatorio, base, args.tolerancia)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressão(ões) acima de {100 * args.tolerancia:.0f}%:")
+            for nome, ref, valor, variacao in regressoes:
+                print(f"   {nome}: {ref:.4g} → {valor:.4g} ({100 * variacao:+.1f}%)")
+            return 1
+        print("\n✓ Nenhuma regressão")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Cache (LRU) de fitness para genomas que não mudaram.
+
+Com elitismo, os melhores genomas voltam idênticos na geração seguinte;
+como a avaliação é determinística para um mesmo adversário (os trials
+são semeados pelo mesmo hash estrutural e contexto, não pela geração nem
+por genome.key), a fitness pode ser reaproveitada. A chave é o hash
+estrutural do genoma (assinaturas.hash_genoma) mais um "contexto" (ex.:
+hash dos arquivos dos adversários e modo de avaliação), então clones
+com outra chave também acertam o cache.
+"""
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from assinaturas import hash_genoma
+
+
+class CacheFitness:
+    """LRU limitado de fitness, com contadores de acertos/falhas."""
+
+    def __init__(self, capacidade: int = 4096):
+        self.capacidade = capacidade
+        self._dados = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def __len__(self):
+        return len(self._dados)
+
+    def obter(self, chave) -> Optional[float]:
+        fitness = self._dados.get(chave)
+        if fitness is None:
+            self.falhas += 1
+            return None
+        self._dados.move_to_end(chave)
+        self.acertos += 1
+        return fitness
+
+    def guardar(self, chave, fitness: float):
+        self._dados[chave] = fitness
+        self._dados.move_to_end(chave)
+        while len(self._dados) > self.capacidade:
+            self._dados.popitem(last=False)
+
+    def envolver(self, funcao_avaliacao: Callable, contexto: Callable[[], tuple]):
+        """
+        Retorna uma função de avaliação para pop.run que só repassa a
+        funcao_avaliacao os genomas ainda não vistos no contexto atual.
+        contexto() é chamado a cada geração (ex.: hashes dos adversários).
+        """
+        def _avaliar(genomas, config):
+            ctx = contexto()
+            faltando, chaves = [], []
+            for gid, g in genomas:
+                chave = (hash_genoma(g), ctx)
+                fitness = self.obter(chave)
+                if fitness is None:
+                    faltando.append((gid, g))
+                    chaves.append(chave)
+                else:
+                    g.fitness = fitness
+            if faltando:
+                funcao_avaliacao(faltando, config)
+                for (_, g), chave in zip(faltando, chaves):
+                    self.guardar(chave, g.fitness)
+        return _avaliar
+
+    def resumo(self) -> str:
+        total = self.acertos + self.falhas
+        taxa = 100.0 * self.acertos / total if total else 0.0
+        return (f"Cache de fitness: {self.acertos} acertos / {self.falhas} falhas "
+                f"({taxa:.1f}%), {len(self)} entradas")
@@ -0,0 +1,168 @@
+"""
+Checkpoints da co-evolução (retomar depois de crash ou Ctrl-C).
+
+Um checkpoint é um dict pickle comprimido com zlib contendo a posição
+na co-evolução (rodada, lado, gerações já feitas), o estado do random
+global (usado pela reprodução do neat), os contadores de geração, os
+arquivos dos campeões dos dois lados, o cache de fitness e, no meio de
+um lado, a população NEAT completa (genomas, espécies/estagnação,
+melhor genoma e os contadores de ids de genomas, espécies e nós).
+
+O estado é serializado na hora (pickle no processo principal, então é
+consistente), mas a compressão e a escrita vão para uma thread; a
+escrita é atômica (arquivo temporário + os.replace), então um crash no
+meio nunca deixa um checkpoint corrompido.
+"""
+import os
+import copy
+import zlib
+import pickle
+import random
+import itertools
+import threading
+from typing import Callable, Optional
+
+import neat
+from neat.reporting import BaseReporter
+
+VERSAO = 1
+
+
+class GravadorCheckpoint:
+    """Escreve checkpoints em segundo plano, um de cada vez, na ordem."""
+
+    def __init__(self, arquivo: str, nivel: int = 6):
+        self.arquivo = arquivo
+        self.nivel = nivel
+        self._thread: Optional[threading.Thread] = None
+        self.erro: Optional[BaseException] = None
+        self.escritos = 0
+
+    def salvar(self, estado: dict):
+        dados = pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL)
+        # um checkpoint por vez: o anterior termina antes (ordem garantida)
+        self.esperar()
+        self._thread = threading.Thread(target=self._escrever, args=(dados,), daemon=True)
+        self._thread.start()
+
+    def _escrever(self, dados: bytes):
+        tmp = self.arquivo + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(zlib.compress(dados, self.nivel))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.arquivo)
+            self.escritos += 1
+        except OSError as e:
+            self.erro = e
+
+    def esperar(self):
+        """Bloqueia até a escrita pendente terminar (ex.: antes de sair)."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.erro is not None:
+            erro, self.erro = self.erro, None
+            print(f"   ⚠ Falha ao gravar checkpoint: {erro}")
+
+    def remover(self):
+        self.esperar()
+        if os.path.exists(self.arquivo):
+            os.remove(self.arquivo)
+
+
+def carregar_checkpoint(arquivo: str) -> Optional[dict]:
+    """Lê um checkpoint (None se não existir ou for de outra versão)."""
+    if not os.path.exists(arquivo):
+        return None
+    with open(arquivo, "rb") as f:
+        estado = pickle.loads(zlib.decompress(f.read()))
+    if estado.get("versao") != VERSAO:
+        return None
+    return estado
+
+
+def _espiar(contador):
+    """(próximo valor, contador que recomeça nele): `contador` fica consumido."""
+    valor = next(contador)
+    return valor, itertools.count(valor)
+
+
+def estado_populacao(pop: neat.Population) -> dict:
+    """
+    Estado de pop para retomar em restaurar_populacao. Chamar entre
+    gerações (end_generation): pop.population já é a próxima geração.
+    Inclui os contadores de ids (genomas, espécies e nós novos, este
+    último guardado na config do neat).
+    """
+    proximo_genoma, pop.reproduction.genome_indexer = _espiar(pop.reproduction.genome_indexer)
+    proximo_especie, pop.species.indexer = _espiar(pop.species.indexer)
+    genome_config = pop.config.genome_config
+    proximo_no = None
+    if genome_config.node_indexer is not None:
+        proximo_no, genome_config.node_indexer = _espiar(genome_config.node_indexer)
+
+    # reporters (pool de workers, arquivos...) e contadores vão à parte
+    especies = copy.copy(pop.species)
+    especies.reporters = None
+    especies.indexer = None
+    return {
+        "geracao": pop.generation + 1,
+        "genomas": pop.population,
+        "especies": especies,
+        "melhor": pop.best_genome,
+        "ancestrais": pop.reproduction.ancestors,
+        "proximo_genoma": proximo_genoma,
+        "proximo_especie": proximo_especie,
+        "proximo_no": proximo_no,
+    }
+
+
+def restaurar_populacao(config, estado: dict) -> neat.Population:
+    especies = estado["especies"]
+    especies.reporters = None
+    especies.indexer = itertools.count(estado["proximo_especie"])
+    pop = neat.Population(config, (estado["genomas"], especies, estado["geracao"]))
+    especies.reporters = pop.reporters
+    pop.best_genome = estado["melhor"]
+    pop.reproduction.ancestors = estado["ancestrais"]
+    # sem isso os filhos voltariam a ser numerados a partir de 1
+    pop.reproduction.genome_indexer = itertools.count(estado["proximo_genoma"])
+    if estado["proximo_no"] is not None:
+        config.genome_config.node_indexer = itertools.count(estado["proximo_no"])
+    return pop
+
+
+def montar_estado(contexto: dict, geracoes_feitas: int = 0,
+                  pop: Optional[neat.Population] = None) -> dict:
+    """Checkpoint completo: contexto + random global (+ população, se houver)."""
+    estado = dict(contexto)
+    estado.update(versao=VERSAO,
+                  geracoes_feitas=geracoes_feitas,
+                  random=random.getstate(),
+                  populacao=estado_populacao(pop) if pop is not None else None)
+    return estado
+
+
+class ReporterCheckpoint(BaseReporter):
+    """
+    Grava um checkpoint a cada `intervalo` gerações de pop.
+
+    contexto() devolve os campos da posição na co-evolução (rodada,
+    lado, contadores...); geracoes_feitas conta a partir de
+    `geracoes_feitas` (gerações de uma execução retomada).
+    """
+
+    def __init__(self, gravador: GravadorCheckpoint, pop: neat.Population,
+                 contexto: Callable[[], dict], intervalo: int = 1, geracoes_feitas: int = 0):
+        self.gravador = gravador
+        self.pop = pop
+        self.contexto = contexto
+        self.intervalo = max(1, intervalo)
+        self.geracoes_feitas = geracoes_feitas
+
+    def end_generation(self, config, population, species_set):
+        self.geracoes_feitas += 1
+        if self.geracoes_feitas % self.intervalo == 0:
+            self.gravador.salvar(montar_estado(self.contexto(), self.geracoes_feitas, self.pop))
@@ -0,0 +1,91 @@
+"""
+Avaliação por corrida (successive halving) sobre os 4 trials de
+avaliar_genoma.
+
+Todos os genomas rodam os trials do primeiro nível (por padrão, um só);
+a cada nível só a fração 1/eta melhor ganha mais trials. Quem fica para
+trás recebe a média dos trials que jogou, limitada pela pior fitness de
+quem avançou — a ordem da seleção continua a da corrida, com bem menos
+partidas por geração.
+"""
+import time
+from typing import Callable, Sequence
+
+
+class AvaliadorCorrida:
+    """
+    Função de avaliação para pop.run (use .evaluate).
+
+    avaliar_parcial(genomas, config, indices_trials) -> fitness média de
+    cada genoma nesses trials (ex.: pong_neat.avaliar_trials_sequencial
+    ou AvaliadorPersistente.avaliar com indices_trials=...).
+
+    niveis: nº acumulado de trials em cada nível (o último = todos); o
+    padrão (1, 4) joga um trial barato por genoma e os 3 restantes só
+    para a metade melhor.
+    eta: a cada nível, segue adiante a fração 1/eta melhor.
+    ordem_trials: ordem em que os trials são jogados; a padrão alterna o
+    lado controlado (dir/serve dir, esq/serve esq, ...), então níveis
+    intermediários como (1, 2, 4) já veem os dois lados no segundo.
+    """
+
+    def __init__(self, avaliar_parcial: Callable, niveis: Sequence[int] = (1, 4),
+                 eta: float = 2.0, ordem_trials: Sequence[int] = (0, 3, 1, 2),
+                 verboso: bool = False):
+        self.avaliar_parcial = avaliar_parcial
+        self.niveis = tuple(niveis)
+        self.ordem_trials = tuple(ordem_trials)
+        self.eta = eta
+        self.verboso = verboso
+        self.relatorios = []
+
+    def evaluate(self, genomas, config):
+        inicio = time.perf_counter()
+        n = len(genomas)
+        if n == 0:
+            return
+        soma = [0.0] * n      # soma das médias parciais × nº de trials
+        jogados = [0] * n
+        vivos = list(range(n))
+        eliminados = []       # [índices] eliminados em cada nível
+        trials_rodados = 0
+
+        feitos = 0
+        for nivel, total in enumerate(self.niveis):
+            indices = list(self.ordem_trials[feitos:total])
+            fits = self.avaliar_parcial([genomas[i] for i in vivos], config, indices)
+            for i, f in zip(vivos, fits):
+                soma[i] += f * len(indices)
+                jogados[i] += len(indices)
+            trials_rodados += len(vivos) * len(indices)
+            feitos = total
+
+            if nivel == len(self.niveis) - 1:
+                break
+            vivos.sort(key=lambda i: soma[i] / jogados[i], reverse=True)
+            k = max(1, int(round(len(vivos) / self.eta)))
+            eliminados.append(vivos[k:])
+            vivos = vivos[:k]
+
+        fitness = [soma[i] / jogados[i] if jogados[i] else 0.0 for i in range(n)]
+        # eliminados nunca passam de quem avançou mais longe que eles
+        teto = min(fitness[i] for i in vivos)
+        for grupo in reversed(eliminados):
+            for i in grupo:
+                fitness[i] = min(fitness[i], teto)
+            teto = min([teto] + [fitness[i] for i in grupo])
+
+        for (_, g), f in zip(genomas, fitness):
+            g.fitness = f
+
+        relatorio = {
+            "genomas": n,
+            "trials_rodados": trials_rodados,
+            "trials_completos": n * self.niveis[-1],
+            "segundos": time.perf_counter() - inicio,
+        }
+        self.relatorios.append(relatorio)
+        if self.verboso:
+            frac = trials_rodados / max(1, relatorio["trials_completos"])
+            print(f"   🏁 Corrida: {trials_rodados}/{relatorio['trials_completos']} trials "
+                  f"({100 * frac:.0f}%) em {relatorio['segundos']:.2f}s")
@@ -0,0 +1,312 @@
+"""
+Simulação orientada a eventos do Pong (sem pygame), para lados
+determinísticos: fluxos de ações gravados ou controladores consultados a
+cada k frames (ex.: ctrl_ai_heuristico semeado, redes com intervalo de
+decisão).
+
+Entre dois pontos de decisão as ações são constantes, e quase todos os
+frames são só a bola andando em linha reta. Em vez de chamar
+JogoPongSim.step a cada frame, o simulador calcula em forma fechada
+quantos frames faltam para o próximo evento possível (parede, faixa da
+raquete à frente, gol, próxima decisão), move as raquetes de uma vez e
+a bola com as mesmas somas em ponto flutuante do passo a passo; só os
+frames perto de um evento passam por JogoPongSim.step. O resultado
+(placar, rebatidas e pontos de cada frame, estado final) é bit a bit
+igual ao do passo a passo com os mesmos lados (ver passo_a_passo).
+
+Limite: a bola continua andando frame a frame entre os eventos (um laço
+de somas, para não perder a igualdade bit a bit); o que se economiza são
+os controladores, os testes de colisão e o resto de JogoPongSim.step.
+Com k=1 e controladores consultados a cada frame o ganho é só de cerca
+de 1,2x; cresce com o intervalo de decisão (~2x em k=4, 4-6x em k=8..16).
+
+    jogo = JogoPongSim(random.Random(0)); jogo.reset_placar()
+    r = simular(jogo, FluxoAcoes(acoes), ControladorIntervalo(ctrl), 3600)
+    r.placar, r.eventos   # [(frame, col_esq, col_dir, ponto)]
+
+Replay guarda quadros-chave de uma partida gravada (gravar_acoes) para
+ir a qualquer frame sem resimular desde o início.
+"""
+import copy
+import math
+import bisect
+import random
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from simulacao import LARGURA, ALTURA, FPS, JogoPongSim, Observacao
+
+# folga (px) nos limites em forma fechada: muito acima do erro das somas
+# em ponto flutuante de um trecho (centenas de frames)
+_FOLGA = 1e-6
+_NUNCA = 1 << 62
+
+
+# ==========================
+# LADOS DETERMINÍSTICOS
+# ==========================
+class FluxoAcoes:
+    """Ações gravadas (-1/0/+1 por frame), guardadas como trechos constantes."""
+
+    def __init__(self, acoes: Sequence[int] = ()):
+        self.acoes: List[int] = []
+        self.inicios: List[int] = []
+        self.total = 0
+        for a in acoes:
+            self.acrescentar(a)
+
+    def __len__(self):
+        return self.total
+
+    def acrescentar(self, acao: int, frames: int = 1):
+        if frames <= 0:
+            return
+        if not self.acoes or self.acoes[-1] != acao:
+            self.acoes.append(acao)
+            self.inicios.append(self.total)
+        self.total += frames
+
+    def decidir(self, frame: int, obs) -> Tuple[int, int]:
+        """(ação no frame, frame em que ela muda); depois do fim, parado."""
+        if frame >= self.total:
+            return 0, _NUNCA
+        i = bisect.bisect_right(self.inicios, frame) - 1
+        fim = self.inicios[i + 1] if i + 1 < len(self.inicios) else self.total
+        return self.acoes[i], fim
+
+
+class ControladorIntervalo:
+    """
+    Controlador comum (obs -> -1/0/+1) consultado no primeiro frame e
+    depois a cada `intervalo` frames, repetindo a ação entre as consultas
+    (mesma regra de pong_neat.repetir_acao).
+    """
+
+    def __init__(self, ctrl: Callable[[Observacao], int], intervalo: int = 1):
+        self.ctrl = ctrl
+        self.intervalo = max(1, intervalo)
+
+    def decidir(self, frame: int, obs) -> Tuple[int, int]:
+        return self.ctrl(obs), frame + self.intervalo
+
+
+def gravar_acoes(ctrl: Callable[[Observacao], int]):
+    """(controlador que grava cada ação, FluxoAcoes gravado) para replays."""
+    fluxo = FluxoAcoes()
+
+    def _ctrl(obs):
+        acao = ctrl(obs)
+        fluxo.acrescentar(acao)
+        return acao
+    return _ctrl, fluxo
+
+
+# ==========================
+# SIMULADOR
+# ==========================
+class ResultadoEventos:
+    """
+    placar: (esq, dir) ao fim; eventos: [(frame, col_esq, col_dir, ponto)]
+    dos frames com rebatida ou ponto (o que JogoPongSim.step devolveu).
+    frames_passo: frames que precisaram de JogoPongSim.step.
+    """
+    __slots__ = ("placar", "eventos", "frames", "frames_passo")
+
+    def __init__(self):
+        self.placar = (0, 0)
+        self.eventos: List[Tuple[int, bool, bool, Optional[str]]] = []
+        self.frames = 0
+        self.frames_passo = 0
+
+
+def _fixo(acao: int):
+    return lambda obs: acao
+
+
+_FIXOS = {-1: _fixo(-1), 0: _fixo(0), 1: _fixo(1)}
+
+
+def _observar(jogo: JogoPongSim) -> Observacao:
+    # mesma observação que JogoPongSim.step monta no início do frame
+    bola, obs = jogo.bola, jogo.obs
+    obs.ball_x = bola.x
+    obs.ball_y = bola.y
+    obs.ball_vx = bola.dirx * bola.vel
+    obs.ball_vy = bola.diry * bola.vel
+    obs.left_y = jogo.raq_esq.y + jogo.raq_esq.altura // 2
+    obs.right_y = jogo.raq_dir.y + jogo.raq_dir.altura // 2
+    return obs
+
+
+def frames_livres(jogo: JogoPongSim, dt: float) -> int:
+    """
+    Quantos dos próximos frames certamente não têm parede, rebatida nem
+    gol, com as raquetes onde estiverem (0 = o próximo pode ter).
+    """
+    bola = jogo.bola
+    r = bola.raio
+    x, y = bola.x, bola.y
+    dx = bola.dirx * bola.vel * dt
+    dy = bola.diry * bola.vel * dt
+    n = _NUNCA
+
+    # paredes: top <= 0 / bottom >= ALTURA
+    if dy < 0:
+        n = min(n, math.floor((y - r - _FOLGA) / -dy))
+    elif dy > 0:
+        n = min(n, math.floor((ALTURA - r - _FOLGA - y) / dy))
+
+    # rebatida exige sobreposição em x com a AABB truncada da bola:
+    # rq.x + 1 - r <= x < rq.x + largura + r
+    for rq in (jogo.raq_esq, jogo.raq_dir):
+        ini, fim = rq.x + 1 - r, rq.x + rq.largura + r
+        if ini - _FOLGA <= x < fim + _FOLGA:
+            return 0
+        if dx < 0 and x >= fim:
+            n = min(n, math.floor((x - fim - _FOLGA) / -dx))
+        elif dx > 0 and x < ini:
+            n = min(n, math.floor((ini - _FOLGA - x) / dx))
+
+    # gols: right < 0 / left > LARGURA
+    if dx < 0:
+        n = min(n, math.floor((x + r - _FOLGA) / -dx))
+    elif dx > 0:
+        n = min(n, math.floor((LARGURA + r - _FOLGA - x) / dx))
+    return max(0, n)
+
+
+def _avancar(jogo: JogoPongSim, k: int, acao_esq: int, acao_dir: int, dt: float):
+    # k frames sem eventos: raquetes de uma vez (passos inteiros; o
+    # limite do campo aplicado no fim dá o mesmo que a cada frame) e a
+    # bola com as mesmas somas de BolaSim.mover
+    for rq, acao in ((jogo.raq_esq, acao_esq), (jogo.raq_dir, acao_dir)):
+        d = int(rq.vel * acao * dt)
+        if d:
+            rq.y = min(max(rq.y + k * d, 0), ALTURA - rq.altura)
+    bola = jogo.bola
+    dx = bola.dirx * bola.vel * dt
+    dy = bola.diry * bola.vel * dt
+    x, y = bola.x, bola.y
+    for _ in range(k):
+        x += dx
+        y += dy
+    bola.x, bola.y = x, y
+
+
+def simular(jogo: JogoPongSim, esq, dir_, frames: int, dt: float = 1.0 / FPS,
+            inicio: int = 0, resultado: Optional[ResultadoEventos] = None) -> ResultadoEventos:
+    """
+    Avança `jogo` do frame `inicio` até `frames` por eventos. esq/dir_:
+    FluxoAcoes, ControladorIntervalo ou qualquer objeto com
+    decidir(frame, obs) -> (ação, frame da próxima decisão).
+    resultado: acumula nele (continuação de uma simulação anterior).
+    """
+    if jogo.varredura:
+        raise ValueError("simulação por eventos só na colisão discreta (varredura=False)")
+    res = resultado if resultado is not None else ResultadoEventos()
+    frame = inicio
+    prox_esq = prox_dir = inicio
+    acao_esq = acao_dir = 0
+    livres = -1  # frames sem eventos a partir daqui (-1 = recalcular)
+    while frame < frames:
+        if frame >= prox_esq or frame >= prox_dir:
+            obs = _observar(jogo)
+            # mesma ordem de JogoPongSim.step: esquerda, depois direita
+            if frame >= prox_esq:
+                acao_esq, prox_esq = esq.decidir(frame, obs)
+            if frame >= prox_dir:
+                acao_dir, prox_dir = dir_.decidir(frame, obs)
+
+        if livres < 0:
+            livres = frames_livres(jogo, dt)
+        k = min(livres, prox_esq - frame, prox_dir - frame, frames - frame)
+        if k > 0:
+            # a velocidade da bola só muda num evento: o limite vale até lá
+            _avancar(jogo, k, acao_esq, acao_dir, dt)
+            livres -= k
+            frame += k
+            continue
+
+        col_esq, col_dir, ponto = jogo.step(dt, _FIXOS[acao_esq], _FIXOS[acao_dir])
+        res.frames_passo += 1
+        livres = -1
+        if col_esq or col_dir or ponto is not None:
+            res.eventos.append((frame, col_esq, col_dir, ponto))
+        frame += 1
+
+    res.frames = frame
+    res.placar = (jogo.placar_esq, jogo.placar_dir)
+    return res
+
+
+def passo_a_passo(jogo: JogoPongSim, esq, dir_, frames: int, dt: float = 1.0 / FPS) -> ResultadoEventos:
+    """Referência: os mesmos lados com JogoPongSim.step em todo frame."""
+    estado = {"esq": (0, 0), "dir": (0, 0)}
+
+    def _ctrl(lado, fonte):
+        def _c(obs):
+            acao, prox = estado[lado]
+            if frame >= prox:
+                acao, prox = fonte.decidir(frame, obs)
+                estado[lado] = (acao, prox)
+            return acao
+        return _c
+
+    ctrl_esq, ctrl_dir = _ctrl("esq", esq), _ctrl("dir", dir_)
+    res = ResultadoEventos()
+    for frame in range(frames):
+        col_esq, col_dir, ponto = jogo.step(dt, ctrl_esq, ctrl_dir)
+        if col_esq or col_dir or ponto is not None:
+            res.eventos.append((frame, col_esq, col_dir, ponto))
+    res.frames = res.frames_passo = frames
+    res.placar = (jogo.placar_esq, jogo.placar_dir)
+    return res
+
+
+# ==========================
+# REPLAY
+# ==========================
+class Replay:
+    """
+    Partida gravada (dois FluxoAcoes) reproduzida por eventos, com um
+    quadro-chave (cópia do jogo, rng incluído) a cada intervalo_chave
+    frames: estado_em(f) parte do quadro anterior a f.
+    semente: do random.Random da bola, preparada como em avaliar_genoma
+    (reset_placar + saque para serve_para).
+    """
+
+    def __init__(self, semente, fluxo_esq: FluxoAcoes, fluxo_dir: FluxoAcoes,
+                 serve_para="dir", dt: float = 1.0 / FPS, intervalo_chave: int = 600):
+        self.fluxo_esq = fluxo_esq
+        self.fluxo_dir = fluxo_dir
+        self.dt = dt
+        self.frames = max(len(fluxo_esq), len(fluxo_dir))
+
+        jogo = JogoPongSim(random.Random(semente))
+        jogo.reset_placar()
+        jogo.reiniciar_round(serve_para)
+        self.chaves: List[Tuple[int, JogoPongSim]] = []
+        self.resultado = ResultadoEventos()
+        for ini in range(0, self.frames, max(1, intervalo_chave)):
+            self.chaves.append((ini, copy.deepcopy(jogo)))
+            simular(jogo, fluxo_esq, fluxo_dir, min(self.frames, ini + intervalo_chave), dt,
+                    inicio=ini, resultado=self.resultado)
+        self.final = jogo
+
+    @property
+    def placar(self) -> Tuple[int, int]:
+        return self.resultado.placar
+
+    @property
+    def eventos(self):
+        return self.resultado.eventos
+
+    def estado_em(self, frame: int) -> JogoPongSim:
+        """Cópia do jogo no início de `frame` (0..frames)."""
+        frame = max(0, min(frame, self.frames))
+        if frame == self.frames:
+            return copy.deepcopy(self.final)
+        i = bisect.bisect_right([f for f, _ in self.chaves], frame) - 1
+        inicio, chave = self.chaves[i]
+        jogo = copy.deepcopy(chave)
+        simular(jogo, self.fluxo_esq, self.fluxo_dir, frame, self.dt, inicio=inicio)
+        return jogo
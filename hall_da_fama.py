@@ -0,0 +1,78 @@
+"""
+Hall da fama: campeões passados de um lado da co-evolução.
+
+Cada lado guarda até `capacidade` campeões (os mais antigos saem
+primeiro) num arquivo binário compacto, com a rede de cada um no formato
+.rede (redes.rede_para_bytes), não o genoma:
+
+    MAGICO, versão, próximo id, nº de entradas
+    por entrada: id, rótulo (utf-8), rede (bytes)
+
+Os ids nunca se repetem num mesmo arquivo, então quem compila as redes
+(pong_neat._rede_hall) pode guardá-las por id entre gerações.
+"""
+import os
+import struct
+from typing import List, Tuple
+
+MAGICO = b"PNHF"
+_CABECALHO = struct.Struct("<4sHII")
+_ENTRADA = struct.Struct("<IHI")
+
+
+class HallDaFama:
+    """Arquivo de campeões de um lado; carrega `arquivo` se já existir."""
+
+    def __init__(self, arquivo: str, capacidade: int = 200):
+        self.arquivo = arquivo
+        self.capacidade = capacidade
+        self.entradas: List[Tuple[int, str, bytes]] = []  # (id, rótulo, rede)
+        self.proximo_id = 1
+        if os.path.exists(arquivo):
+            with open(arquivo, "rb") as f:
+                self._de_bytes(f.read())
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def adicionar(self, rede: bytes, rotulo: str = "") -> int:
+        """Acrescenta uma rede (bytes .rede); descarta as mais antigas além da capacidade."""
+        id_ = self.proximo_id
+        self.proximo_id += 1
+        self.entradas.append((id_, rotulo, rede))
+        if len(self.entradas) > self.capacidade:
+            del self.entradas[:len(self.entradas) - self.capacidade]
+        return id_
+
+    def redes(self) -> List[Tuple[int, bytes]]:
+        """[(id, rede)] para publicar na avaliação."""
+        return [(id_, rede) for id_, _, rede in self.entradas]
+
+    def salvar(self):
+        tmp = self.arquivo + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self._para_bytes())
+        os.replace(tmp, self.arquivo)
+
+    def _para_bytes(self) -> bytes:
+        partes = [_CABECALHO.pack(MAGICO, 1, self.proximo_id, len(self.entradas))]
+        for id_, rotulo, rede in self.entradas:
+            r = rotulo.encode()
+            partes.append(_ENTRADA.pack(id_, len(r), len(rede)))
+            partes.append(r)
+            partes.append(rede)
+        return b"".join(partes)
+
+    def _de_bytes(self, dados: bytes):
+        magico, versao, self.proximo_id, n = _CABECALHO.unpack_from(dados)
+        if magico != MAGICO or versao != 1:
+            raise ValueError(f"{self.arquivo}: não é um hall da fama")
+        pos = _CABECALHO.size
+        self.entradas = []
+        for _ in range(n):
+            id_, n_rotulo, n_rede = _ENTRADA.unpack_from(dados, pos)
+            pos += _ENTRADA.size
+            rotulo = dados[pos:pos + n_rotulo].decode()
+            pos += n_rotulo
+            self.entradas.append((id_, rotulo, dados[pos:pos + n_rede]))
+            pos += n_rede
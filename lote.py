@@ -0,0 +1,463 @@
+"""
+Pong em lote (NumPy): N partidas avançando juntas, passo a passo.
+
+Mesma física de simulacao.JogoPongSim, mas com o estado de bolas e
+raquetes em arrays de tamanho N. Serve para avaliar a população inteira
+num único processo sem um loop Python por partida.
+
+Também compila redes NEAT (feed-forward, tanh/sum) em arrays para que a
+população inteira faça a inferência de um frame numa única chamada.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+import neat
+from neat.activations import tanh_activation
+from neat.aggregations import sum_aggregation
+
+from redes import intervalo_em_passos
+from simulacao import LARGURA, ALTURA
+
+# Mesmos valores padrão de simulacao.RaqueteSim / BolaSim / JogoPongSim
+MARGEM = 36
+RAQ_LARGURA = 14
+RAQ_ALTURA = 100
+RAQ_VEL = 420
+RAQ_X_ESQ = MARGEM
+RAQ_X_DIR = LARGURA - MARGEM - RAQ_LARGURA
+BOLA_RAIO = 9
+BOLA_VEL_INICIAL = 420
+BOLA_INCREMENTO_VEL = 24
+BOLA_VEL_MAX = 1000
+BOLA_ANGULO_MAX = math.radians(60)
+
+# Códigos de ponto devolvidos por BatchPong.step
+PONTO_NENHUM = 0
+PONTO_ESQ = 1
+PONTO_DIR = 2
+
+# Direção normalizada do saque (igual a BolaSim.resetar)
+_NORMA_SAQUE = math.hypot(1.0, 0.25)
+
+
+class BatchPong:
+    """
+    N partidas de Pong em lockstep.
+
+    step() recebe as ações (-1/0/+1) de cada lado como arrays de tamanho N
+    e devolve (col_esq, col_dir, ponto) também como arrays.
+    """
+
+    def __init__(self, n: int, rng: Optional[np.random.Generator] = None):
+        self.n = n
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.bola_x = np.full(n, LARGURA / 2)
+        self.bola_y = np.full(n, ALTURA / 2)
+        self.bola_vel = np.full(n, float(BOLA_VEL_INICIAL))
+        self.bola_dirx = np.ones(n)
+        self.bola_diry = np.zeros(n)
+
+        # topo das raquetes (inteiro, como o pygame.Rect original)
+        self.raq_esq_y = np.full(n, ALTURA // 2 - 50, dtype=np.int64)
+        self.raq_dir_y = np.full(n, ALTURA // 2 - 50, dtype=np.int64)
+
+        self.placar_esq = np.zeros(n, dtype=np.int64)
+        self.placar_dir = np.zeros(n, dtype=np.int64)
+
+        self.reset_placar()
+
+    # --------------------------
+    # saque / placar
+    # --------------------------
+    def resetar(self, lado, idx=None):
+        """
+        Recoloca a bola no centro com saque para `lado` (+1 direita,
+        -1 esquerda) nas partidas `idx` (todas se None).
+        """
+        if idx is None:
+            idx = np.arange(self.n)
+        k = len(idx)
+        if k == 0:
+            return
+        lado = np.broadcast_to(np.asarray(lado, dtype=float), (k,))
+        diry = self.rng.choice((-0.25, 0.25), size=k)
+        self.bola_x[idx] = LARGURA / 2
+        self.bola_y[idx] = ALTURA / 2
+        self.bola_vel[idx] = float(BOLA_VEL_INICIAL)
+        self.bola_dirx[idx] = lado / _NORMA_SAQUE
+        self.bola_diry[idx] = diry / _NORMA_SAQUE
+
+    def reiniciar_round(self, quem_marco: str, idx=None):
+        # quem_marco: "esq" ou "dir" (mesma convenção de JogoPongSim)
+        self.resetar(-1 if quem_marco == "esq" else 1, idx)
+
+    def reset_placar(self):
+        self.placar_esq[:] = 0
+        self.placar_dir[:] = 0
+        self.reiniciar_round("dir")
+
+    # --------------------------
+    # observação
+    # --------------------------
+    @property
+    def centro_esq(self): return self.raq_esq_y + RAQ_ALTURA // 2
+    @property
+    def centro_dir(self): return self.raq_dir_y + RAQ_ALTURA // 2
+
+    def estado(self) -> dict:
+        """Mesmas chaves do estado de JogoPongSim.step, com arrays."""
+        return {
+            "ball_x": self.bola_x,
+            "ball_y": self.bola_y,
+            "ball_vx": self.bola_dirx * self.bola_vel,
+            "ball_vy": self.bola_diry * self.bola_vel,
+            "left_y": self.centro_esq,
+            "right_y": self.centro_dir,
+        }
+
+    # --------------------------
+    # física
+    # --------------------------
+    def _mover_raquete(self, y, acao, dt):
+        y += np.trunc(RAQ_VEL * acao * dt).astype(np.int64)
+        np.clip(y, 0, ALTURA - RAQ_ALTURA, out=y)
+
+    def _colide(self, raq_x, raq_y, eh_esquerda: bool):
+        # AABB da bola truncada para int (mesmo critério de BolaSim)
+        bx = np.trunc(self.bola_x - BOLA_RAIO)
+        by = np.trunc(self.bola_y - BOLA_RAIO)
+        lado = BOLA_RAIO * 2
+        hit = ((bx < raq_x + RAQ_LARGURA) & (raq_x < bx + lado) &
+               (by < raq_y + RAQ_ALTURA) & (raq_y < by + lado))
+        idx = np.flatnonzero(hit)
+        if len(idx) == 0:
+            return hit
+
+        centro = raq_y[idx] + RAQ_ALTURA // 2
+        relativo = (self.bola_y[idx] - centro) / (RAQ_ALTURA / 2)
+        angulos = (np.clip(relativo, -1.0, 1.0) * BOLA_ANGULO_MAX).tolist()
+
+        # Rebatidas são raras: cos/sin/hypot escalares garantem resultado
+        # bit a bit igual ao de BolaSim.colide_com_raquete.
+        dirx = np.empty(len(idx))
+        diry = np.empty(len(idx))
+        for j, ang in enumerate(angulos):
+            dx = abs(math.cos(ang))
+            if not eh_esquerda:
+                dx *= -1
+            dy = math.sin(ang)
+            m = math.hypot(dx, dy)
+            dirx[j] = dx / m
+            diry[j] = dy / m
+        self.bola_dirx[idx] = dirx
+        self.bola_diry[idx] = diry
+
+        # empurra para fora
+        if eh_esquerda:
+            self.bola_x[idx] = raq_x + RAQ_LARGURA + BOLA_RAIO + 1
+        else:
+            self.bola_x[idx] = raq_x - BOLA_RAIO - 1
+
+        self.bola_vel[idx] = np.minimum(self.bola_vel[idx] + BOLA_INCREMENTO_VEL, BOLA_VEL_MAX)
+        return hit
+
+    def step(self, dt, acao_esq, acao_dir):
+        self._mover_raquete(self.raq_esq_y, acao_esq, dt)
+        self._mover_raquete(self.raq_dir_y, acao_dir, dt)
+
+        # movimento da bola
+        self.bola_x += self.bola_dirx * self.bola_vel * dt
+        self.bola_y += self.bola_diry * self.bola_vel * dt
+
+        # colisão vertical
+        topo = self.bola_y - BOLA_RAIO <= 0
+        fundo = ~topo & (self.bola_y + BOLA_RAIO >= ALTURA)
+        self.bola_y[topo] = BOLA_RAIO
+        self.bola_y[fundo] = ALTURA - BOLA_RAIO
+        self.bola_diry[topo | fundo] *= -1
+
+        col_esq = self._colide(RAQ_X_ESQ, self.raq_esq_y, True)
+        col_dir = self._colide(RAQ_X_DIR, self.raq_dir_y, False)
+
+        ponto = np.zeros(self.n, dtype=np.int8)
+        idx_dir = np.flatnonzero(self.bola_x + BOLA_RAIO < 0)
+        idx_esq = np.flatnonzero(self.bola_x - BOLA_RAIO > LARGURA)
+        if len(idx_dir):
+            self.placar_dir[idx_dir] += 1
+            ponto[idx_dir] = PONTO_DIR
+            self.reiniciar_round("dir", idx_dir)
+        if len(idx_esq):
+            self.placar_esq[idx_esq] += 1
+            ponto[idx_esq] = PONTO_ESQ
+            self.reiniciar_round("esq", idx_esq)
+
+        return col_esq, col_dir, ponto
+
+
+def acumular_fitness(fit, jogo: BatchPong, lado_dir, col_esq, col_dir, ponto):
+    """
+    Aplica, em lote, o shaping por passo de avaliar_genoma.
+    lado_dir: array bool, True onde a rede avaliada controla a direita.
+    """
+    # sobrevivência
+    fit += 0.01
+
+    # defesa (contato da raquete controlada)
+    fit += 2.5 * np.where(lado_dir, col_dir, col_esq)
+
+    # pontuação
+    a_favor = np.where(lado_dir, ponto == PONTO_DIR, ponto == PONTO_ESQ)
+    contra = np.where(lado_dir, ponto == PONTO_ESQ, ponto == PONTO_DIR)
+    fit += 3.0 * a_favor
+    fit -= 8.0 * contra
+
+    # custo de distância quando a bola vem para o seu lado
+    vem = np.where(lado_dir,
+                   (jogo.bola_dirx > 0) & (jogo.bola_x > LARGURA * 0.5),
+                   (jogo.bola_dirx < 0) & (jogo.bola_x < LARGURA * 0.5))
+    centro = np.where(lado_dir, jogo.centro_dir, jogo.centro_esq)
+    dy = np.abs(centro - jogo.bola_y) / (ALTURA / 2)
+    fit -= np.where(vem, 0.003 * dy, 0.0)
+    return fit
+
+
+# ==========================
+# REDES EM LOTE
+# ==========================
+def _tanh(z):
+    """
+    math.tanh elemento a elemento (z já limitado como em tanh_activation).
+    np.tanh difere no último bit perto da saturação, o que basta para
+    mudar o argmax em relação a FeedForwardNetwork.
+    """
+    return np.fromiter(map(math.tanh, z.ravel().tolist()), float, z.size).reshape(z.shape)
+
+
+class RedesLote:
+    """
+    Várias FeedForwardNetwork compiladas em arrays de "gather" por camada.
+
+    Cada rede tem um vetor de estado com S posições:
+      [0..n_in)        entradas
+      n_in             zero fixo (alvo das ligações de preenchimento)
+      n_in+1 ...       saídas e nós ocultos
+      S-1              descarte (destino dos nós de preenchimento)
+
+    Em cada camada, todos os nós de todas as redes são avaliados juntos;
+    as ligações são somadas na mesma ordem de FeedForwardNetwork.activate
+    e a ativação é a mesma de tanh_activation: saídas bit a bit iguais.
+    """
+
+    def __init__(self, redes):
+        if not redes:
+            raise ValueError("RedesLote precisa de pelo menos uma rede")
+        n_in = len(redes[0].input_nodes)
+        n_out = len(redes[0].output_nodes)
+
+        por_rede = []  # [(camadas, slot_de_cada_no)]
+        s_max = n_in + 1 + n_out
+        for rede in redes:
+            if len(rede.input_nodes) != n_in or len(rede.output_nodes) != n_out:
+                raise ValueError("Todas as redes precisam ter as mesmas entradas/saídas")
+            slot = {k: i for i, k in enumerate(rede.input_nodes)}
+            for i, k in enumerate(rede.output_nodes):
+                slot[k] = n_in + 1 + i
+            nivel = dict.fromkeys(rede.input_nodes, 0)
+            camadas = []
+            for node, act, agg, bias, resp, links in rede.node_evals:
+                if act is not tanh_activation or agg is not sum_aggregation:
+                    raise ValueError("RedesLote suporta apenas ativação tanh e agregação sum")
+                if node not in slot:
+                    slot[node] = len(slot) + 1  # +1 pelo slot zero
+                # node_evals já está em ordem topológica
+                nv = 1 + max((nivel[i] for i, _ in links), default=0)
+                nivel[node] = nv
+                while len(camadas) < nv:
+                    camadas.append([])
+                camadas[nv - 1].append((slot[node], bias, resp,
+                                        [(slot[i], w) for i, w in links]))
+            por_rede.append(camadas)
+            s_max = max(s_max, len(slot) + 1)
+
+        self.n = len(redes)
+        self.n_in = n_in
+        self.n_out = n_out
+        self.tam_estado = s_max + 1
+        zero = n_in
+        descarte = s_max
+
+        self.camadas = []  # [(dest, bias, resp, src, w)] com 1ª dimensão = rede
+        n_camadas = max(len(c) for c in por_rede)
+        for li in range(n_camadas):
+            nos = [c[li] if li < len(c) else [] for c in por_rede]
+            k = max(len(x) for x in nos)
+            f = max((len(lk) for x in nos for _, _, _, lk in x), default=0)
+            dest = np.full((self.n, k), descarte, dtype=np.intp)
+            bias = np.zeros((self.n, k))
+            resp = np.zeros((self.n, k))
+            src = np.full((self.n, k, max(f, 1)), zero, dtype=np.intp)
+            w = np.zeros((self.n, k, max(f, 1)))
+            for r, lista in enumerate(nos):
+                for j, (d, b, rp, links) in enumerate(lista):
+                    dest[r, j] = d
+                    bias[r, j] = b
+                    resp[r, j] = rp
+                    for q, (si, wi) in enumerate(links):
+                        src[r, j, q] = si
+                        w[r, j, q] = wi
+            self.camadas.append((dest, bias, resp, src, w))
+        self._saidas = np.arange(n_in + 1, n_in + 1 + n_out)
+
+    @classmethod
+    def de_genomas(cls, genomas, config):
+        return cls([neat.nn.FeedForwardNetwork.create(g, config) for g in genomas])
+
+    def repetir(self, idx):
+        """
+        Nova RedesLote cuja linha i é a rede idx[i] (ex.: uma linha por
+        partida). Os arrays são indexados uma vez aqui, não a cada frame.
+        """
+        idx = np.asarray(idx, dtype=np.intp)
+        novo = object.__new__(RedesLote)
+        novo.n = len(idx)
+        novo.n_in = self.n_in
+        novo.n_out = self.n_out
+        novo.tam_estado = self.tam_estado
+        novo._saidas = self._saidas
+        novo.camadas = [tuple(a[idx] for a in camada) for camada in self.camadas]
+        return novo
+
+    def ativar(self, entradas):
+        """entradas (n × n_in) -> saídas (n × n_out)."""
+        linhas = np.arange(self.n)[:, None]
+        v = np.zeros((self.n, self.tam_estado))
+        v[:, :self.n_in] = entradas
+        for dest, bias, resp, src, w in self.camadas:
+            s = np.zeros(dest.shape)
+            for q in range(src.shape[2]):
+                s += v[linhas, src[:, :, q]] * w[:, :, q]
+            z = np.clip(2.5 * (bias + resp * s), -60.0, 60.0)
+            v[linhas, dest] = _tanh(z)
+        return v[:, self._saidas]
+
+    def acoes(self, entradas):
+        """Argmax das 3 saídas -> -1 (cima) / 0 (parado) / +1 (baixo)."""
+        return np.argmax(self.ativar(entradas), axis=1) - 1
+
+
+def entradas_lote(estado: dict, lado_dir):
+    """
+    Versão em lote dos 8 inputs de ctrl_por_rede.
+    lado_dir: array bool, True onde o controlador joga à direita.
+    """
+    def _norm(v, lo, hi):
+        return (v - lo) / (hi - lo) * 2 - 1.0
+
+    paddle = np.where(lado_dir, estado["right_y"], estado["left_y"])
+    bx = _norm(estado["ball_x"], 0, LARGURA)
+    by = _norm(estado["ball_y"], 0, ALTURA)
+    vx = _norm(estado["ball_vx"], -1000, 1000)
+    vy = _norm(estado["ball_vy"], -1000, 1000)
+    py = _norm(paddle, 0, ALTURA)
+    dist_y = by - py
+    dist_x = np.where(lado_dir,
+                      _norm(LARGURA - estado["ball_x"], 0, LARGURA),
+                      _norm(estado["ball_x"], 0, LARGURA))
+    para_mim = np.where(np.where(lado_dir, estado["ball_vx"] > 0, estado["ball_vx"] < 0), 1.0, -1.0)
+    return np.column_stack((bx, by, vx, vy, py, dist_y, dist_x, para_mim))
+
+
+class HeuristicoLote:
+    """Versão em lote de ctrl_ai_heuristico (lag/erro por partida)."""
+
+    def __init__(self, lag, erro, rng: Optional[np.random.Generator] = None):
+        self.lag = np.asarray(lag, dtype=float)
+        self.erro = np.asarray(erro, dtype=float)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.acumulador = np.zeros(self.lag.shape)
+
+    def acoes(self, estado: dict, lado_dir):
+        y_target = estado["ball_y"] + self.rng.uniform(-self.erro, self.erro)
+        self.acumulador = (1 - self.lag) * self.acumulador + self.lag * y_target
+        paddle = np.where(lado_dir, estado["right_y"], estado["left_y"])
+        return np.where(paddle < self.acumulador - 8, 1,
+                        np.where(paddle > self.acumulador + 8, -1, 0))
+
+
+# 4 trials por genoma: controla dir/esq × serve dir/esq (igual a avaliar_genoma)
+TRIALS = (("dir", "dir"), ("dir", "esq"), ("esq", "dir"), ("esq", "esq"))
+
+
+def avaliar_lote(redes: RedesLote, rede_adv_esq=None, rede_adv_dir=None,
+                 max_steps=300, dt=1.0 / 60.0, rng: Optional[np.random.Generator] = None,
+                 intervalo_decisao=1):
+    """
+    Avalia todas as redes de `redes` nos 4 trials de avaliar_genoma, com
+    todas as partidas (redes.n × 4) em lockstep num único BatchPong.
+
+    rede_adv_esq / rede_adv_dir: FeedForwardNetwork do adversário que joga
+    à esquerda (quando a rede avaliada está à direita) e vice-versa; None
+    usa o heurístico com lag/erro sorteados por trial.
+
+    intervalo_decisao: as redes avaliadas decidem a cada k frames e
+    repetem a ação entre as decisões; as adversárias usam o intervalo
+    gravado nelas, convertido para passos de dt (redes.intervalo_em_passos).
+
+    Retorna um array (redes.n,) com a média de fitness dos trials.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n_trials = len(TRIALS)
+    m = redes.n * n_trials
+    trial = np.tile(np.arange(n_trials), redes.n)
+    lado_dir = np.array([TRIALS[t][0] == "dir" for t in trial])
+    serve_esq = np.array([TRIALS[t][1] == "esq" for t in trial])
+
+    jogo = BatchPong(m, rng=rng)
+    # força o primeiro saque para um lado
+    jogo.reiniciar_round("esq", np.flatnonzero(serve_esq))
+    jogo.reiniciar_round("dir", np.flatnonzero(~serve_esq))
+
+    pop = redes.repetir(np.repeat(np.arange(redes.n), n_trials))
+
+    # adversário: rede (se houver) ou heurístico, do lado oposto
+    adv_redes = [r for r in (rede_adv_esq, rede_adv_dir) if r is not None]
+    adv_rede = None
+    if adv_redes:
+        idx_adv = np.where(lado_dir, 0, len(adv_redes) - 1)
+        adv_rede = RedesLote(adv_redes).repetir(idx_adv)
+        intervalos = [intervalo_em_passos(r, dt) for r in adv_redes]
+        intervalo_adv = np.where(lado_dir, intervalos[0], intervalos[-1])
+    usa_rede = np.where(lado_dir, rede_adv_esq is not None, rede_adv_dir is not None)
+    heur = None
+    if not usa_rede.all():
+        heur = HeuristicoLote(rng.uniform(0.15, 0.35, m), rng.uniform(6, 14, m), rng)
+
+    fit = np.zeros(m)
+    acao_pop = acao_rede_adv = None
+    for passo in range(max_steps):
+        estado = jogo.estado()
+        if passo % intervalo_decisao == 0:
+            acao_pop = pop.acoes(entradas_lote(estado, lado_dir))
+        if adv_rede is not None:
+            # só as partidas em que a rede adversária decide neste frame mudam
+            decide = passo % intervalo_adv == 0
+            if acao_rede_adv is None:
+                acao_rede_adv = adv_rede.acoes(entradas_lote(estado, ~lado_dir))
+            elif decide.any():
+                acao_rede_adv = np.where(decide, adv_rede.acoes(entradas_lote(estado, ~lado_dir)),
+                                         acao_rede_adv)
+        if heur is None:
+            acao_adv = acao_rede_adv
+        elif adv_rede is None:
+            acao_adv = heur.acoes(estado, ~lado_dir)
+        else:
+            acao_adv = np.where(usa_rede, acao_rede_adv, heur.acoes(estado, ~lado_dir))
+
+        acao_esq = np.where(lado_dir, acao_adv, acao_pop)
+        acao_dir = np.where(lado_dir, acao_pop, acao_adv)
+        col_esq, col_dir, ponto = jogo.step(dt, acao_esq, acao_dir)
+        acumular_fitness(fit, jogo, lado_dir, col_esq, col_dir, ponto)
+
+    return fit.reshape(redes.n, n_trials).mean(axis=1)
@@ -0,0 +1,229 @@
+"""
+Pool de workers persistente para a avaliação NEAT.
+
+Um único multiprocessing.Pool vive durante toda a co-evolução (todas as
+rodadas e os dois lados). Config e adversários não vão junto com cada
+tarefa: são publicados como um "broadcast" versionado (um arquivo
+temporário lido uma vez por worker a cada versão nova), e as tarefas
+carregam só (versão, lote de genomas já serializado).
+
+Os genomas seguem em lotes (não um apply_async por genoma) e as fitness
+voltam como um array('d') compacto; cada geração gera um relatório de
+vazão (genomas/s, bytes de IPC e utilização dos workers) para calibrar
+o tamanho do lote.
+
+A função avaliada recebe (genome, config, geracao_semente): o avaliador
+é também um reporter do neat e repassa a geração corrente aos workers,
+deixando a avaliação reprodutível. mapear() aplica o mesmo esquema a
+itens quaisquer (ex.: fitness + contadores da parada antecipada,
+partidas da co-evolução simultânea).
+"""
+import os
+import math
+import time
+import pickle
+import shutil
+import signal
+import tempfile
+import multiprocessing
+from array import array
+from typing import Callable, Optional
+
+from neat.reporting import BaseReporter
+
+# ==========================
+# LADO DO WORKER
+# ==========================
+_WORKER = {"funcao": None, "versao": -1, "config": None}
+
+
+def _iniciar_worker(funcao: Callable, config=None):
+    # Ctrl-C é tratado só no processo principal, que encerra o pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # desserializar `funcao` já importou o módulo dela: worker aquecido
+    _WORKER["funcao"] = funcao
+    if config is not None:
+        # versão 0: config enviada uma única vez, na criação do worker
+        _WORKER["config"] = config
+        _WORKER["versao"] = 0
+
+
+def _receber_broadcast(versao: int, caminho: str):
+    if _WORKER["versao"] == versao:
+        return
+    with open(caminho, "rb") as f:
+        dados = pickle.load(f)
+    _WORKER["config"] = dados["config"]
+    if dados["preparar"] is not None:
+        dados["preparar"](dados["config"], dados["extra"])
+    _WORKER["versao"] = versao
+
+
+def _avaliar_lote(versao: int, caminho: Optional[str], geracao: int, dados: bytes,
+                  kwargs: dict, funcao: Optional[Callable] = None, por_item: int = 1):
+    # devolve (valores em bytes, segundos ocupados neste lote)
+    inicio = time.perf_counter()
+    if caminho is not None:
+        _receber_broadcast(versao, caminho)
+    funcao = funcao or _WORKER["funcao"]
+    config = _WORKER["config"]
+    if por_item == 1:
+        valores = array("d", (funcao(item, config, geracao, **kwargs) for item in pickle.loads(dados)))
+    else:
+        valores = array("d")
+        for item in pickle.loads(dados):
+            valores.extend(funcao(item, config, geracao, **kwargs))
+    return valores.tobytes(), time.perf_counter() - inicio
+
+
+# ==========================
+# LADO DO PROCESSO PRINCIPAL
+# ==========================
+class AvaliadorPersistente(BaseReporter):
+    """
+    Substituto de neat.ParallelEvaluator com pool reaproveitável.
+
+    Uso:
+        with AvaliadorPersistente(n, parallel_wrapper) as av:
+            av.publicar(config, preparar=..., extra=...)
+            pop.add_reporter(av)  # geração corrente -> sementes
+            pop.run(av.evaluate, geracoes)
+
+    preparar(config, extra), se dado, roda uma vez em cada worker por
+    versão publicada (ex.: pré-carregar as redes adversárias).
+
+    config (opcional) vai no initializer dos workers; enquanto evaluate()
+    receber esse mesmo objeto, nada mais precisa ser publicado.
+    tamanho_lote: genomas por tarefa (None = ~4 lotes por worker).
+    verboso: imprime o relatório de vazão a cada geração.
+    """
+
+    def __init__(self, num_workers: int, funcao: Callable, config=None,
+                 tamanho_lote: Optional[int] = None, timeout: Optional[float] = None,
+                 verboso: bool = False):
+        self.num_workers = num_workers
+        self.tamanho_lote = tamanho_lote
+        self.timeout = timeout
+        self.verboso = verboso
+        self.pool = multiprocessing.Pool(num_workers, initializer=_iniciar_worker,
+                                         initargs=(funcao, config))
+        self._dir = tempfile.mkdtemp(prefix="pong_neat_")
+        self.versao = 0
+        self._caminho = None
+        self._config = config
+        self.relatorios = []  # um dict por chamada de evaluate()
+        self.geracao = 0
+
+    def start_generation(self, generation):
+        self.geracao = generation
+
+    def publicar(self, config, preparar: Optional[Callable] = None, extra=None):
+        """Publica uma nova versão de config/dados para todos os workers."""
+        self.versao += 1
+        caminho = os.path.join(self._dir, f"broadcast_{self.versao}.pkl")
+        with open(caminho, "wb") as f:
+            pickle.dump({"config": config, "preparar": preparar, "extra": extra}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        if self._caminho is not None:
+            # publicar só acontece entre gerações: nenhuma tarefa pendente
+            # ainda aponta para a versão anterior
+            os.remove(self._caminho)
+        self._caminho = caminho
+        self._config = config
+
+    def _tamanho_lote(self, n: int) -> int:
+        if self.tamanho_lote is not None:
+            return max(1, self.tamanho_lote)
+        return max(1, math.ceil(n / (self.num_workers * 4)))
+
+    def evaluate(self, genomes, config):
+        for (_, genome), f in zip(genomes, self.avaliar(genomes, config)):
+            genome.fitness = f
+
+    def avaliar(self, genomes, config, **kwargs) -> array:
+        """
+        Avalia (id, genoma) no pool e devolve as fitness na mesma ordem,
+        sem atribuí-las. kwargs extras seguem para a função dos workers
+        (ex.: indices_trials da avaliação por corrida).
+        """
+        return self.mapear(None, [g for _, g in genomes], config, **kwargs)
+
+    def mapear(self, funcao: Optional[Callable], itens: list, config, por_item: int = 1,
+               **kwargs) -> array:
+        """
+        Aplica funcao(item, config, geração, **kwargs) a cada item no pool
+        (None = a função dos workers) e devolve os valores em ordem, com
+        por_item floats por item (ex.: 5 para fitness + contadores da
+        parada antecipada). funcao precisa ser picklável (nível de módulo).
+        """
+        if config is not self._config:
+            self.publicar(config)
+        inicio = time.perf_counter()
+
+        tam = self._tamanho_lote(len(itens))
+        lotes = [itens[i:i + tam] for i in range(0, len(itens), tam)]
+        bytes_enviados = 0
+        jobs = []
+        for lote in lotes:
+            dados = pickle.dumps(lote, protocol=pickle.HIGHEST_PROTOCOL)
+            bytes_enviados += len(dados)
+            jobs.append(self.pool.apply_async(_avaliar_lote,
+                                              (self.versao, self._caminho, self.geracao, dados, kwargs,
+                                               funcao, por_item)))
+
+        bytes_recebidos = 0
+        segundos_workers = 0.0
+        valores = array("d")
+        for job in jobs:
+            resposta, ocupado = job.get(timeout=self.timeout)
+            bytes_recebidos += len(resposta)
+            segundos_workers += ocupado
+            valores.frombytes(resposta)
+
+        segundos = time.perf_counter() - inicio
+        relatorio = {
+            "genomas": len(itens),
+            "segundos": segundos,
+            "genomas_por_s": len(itens) / segundos if segundos > 0 else 0.0,
+            "lotes": len(lotes),
+            "tamanho_lote": tam,
+            "bytes_enviados": bytes_enviados,
+            "bytes_recebidos": bytes_recebidos,
+            "segundos_workers": segundos_workers,
+            # fração do tempo dos workers gasta avaliando (1.0 = sem ociosidade)
+            "utilizacao": segundos_workers / (self.num_workers * segundos) if segundos > 0 else 0.0,
+        }
+        self.relatorios.append(relatorio)
+        if self.verboso:
+            print(self.formatar_relatorio(relatorio))
+        return valores
+
+    @staticmethod
+    def formatar_relatorio(r: dict) -> str:
+        return (f"   ⚙ {r['genomas']} genomas em {r['segundos']:.2f}s "
+                f"({r['genomas_por_s']:.1f} genomas/s) | "
+                f"{r['lotes']} lotes de até {r['tamanho_lote']} | "
+                f"uso {100 * r['utilizacao']:.0f}% | "
+                f"IPC {r['bytes_enviados'] / 1024:.1f} kB ↑ {r['bytes_recebidos'] / 1024:.1f} kB ↓")
+
+    def fechar(self):
+        """Encerramento normal: espera os workers terminarem."""
+        self.pool.close()
+        self.pool.join()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def terminar(self):
+        """Encerramento imediato (ex.: KeyboardInterrupt)."""
+        self.pool.terminate()
+        self.pool.join()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_exc, exc, tb):
+        if tipo_exc is None:
+            self.fechar()
+        else:
+            self.terminar()
+        return False
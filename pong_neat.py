@@ -1,31 +1,67 @@
 import sys
 import os
-import math
 import time
+import hashlib
 import pickle
 import random
 import shutil
 import multiprocessing
-from typing import Optional, Callable
+from typing import Optional, Callable, Sequence
 
-import pygame
 import neat
 
+from assinaturas import hash_arquivo, hash_genoma
+from cache_fitness import CacheFitness
+from checkpoint import (GravadorCheckpoint, ReporterCheckpoint, carregar_checkpoint,
+                        montar_estado, restaurar_populacao)
+from corrida import AvaliadorCorrida
+from hall_da_fama import HallDaFama
+from paralelo import AvaliadorPersistente
+from redes import (RedeCompilada, arquivo_rede, carregar_rede_salva, intervalo_em_passos,
+                   rede_atualizada, rede_de_bytes, rede_do_genoma, rede_para_bytes, salvar_rede)
+from simulacao import LARGURA, ALTURA, FPS, RaqueteSim, BolaSim, JogoPongSim
+from simultaneo import AvaliadorSimultaneo
+from tempos import ReporterTempos, resumo_tempos
+
+
+# ==========================
+# PYGAME SOB DEMANDA
+# ==========================
+class _PygameTardio:
+    """
+    Ocupa o lugar do módulo pygame até o primeiro uso (desenho, teclado,
+    menu): workers e a CLI de treino importam este arquivo sem carregar
+    o pygame. Depois do primeiro acesso, `pygame` é o módulo de verdade.
+    """
+
+    def __getattr__(self, nome):
+        global pygame
+        import pygame as modulo
+        pygame = modulo
+        return getattr(modulo, nome)
+
+
+pygame = _PygameTardio()
+
 # ==========================
 # ARQUIVOS DE GENOMA (IA)
 # ==========================
 ARQ_CAMPEAO = os.path.join(os.path.dirname(__file__), "melhor_genoma.pkl")
 ARQ_IA_1 = os.path.join(os.path.dirname(__file__), "IA_treinada_1.pkl")
 ARQ_IA_2 = os.path.join(os.path.dirname(__file__), "IA_treinada_2.pkl")
+# um registro por geração (ver tempos.ReporterTempos), também em ARQ_TEMPOS
 TEMPOS_GERACOES = []
+ARQ_TEMPOS = os.path.join(os.path.dirname(__file__), "tempos_geracoes.jsonl")
+# co-evolução em andamento (apagado ao concluir; ver checkpoint.py)
+ARQ_CHECKPOINT = os.path.join(os.path.dirname(__file__), "coevolucao.ckpt")
+# campeões passados de cada IA (ver hall_da_fama.py)
+ARQ_HALL_1 = os.path.join(os.path.dirname(__file__), "hall_da_fama_1.hof")
+ARQ_HALL_2 = os.path.join(os.path.dirname(__file__), "hall_da_fama_2.hof")
 
 # ==========================
 # CONFIG VISUAL / JOGO
 # ==========================
-LARGURA = 900
-ALTURA = 600
-FPS = 60
-
+# LARGURA, ALTURA e FPS vêm de simulacao (núcleo headless)
 COR_FUNDO = (10, 10, 15)
 COR_LINHAS = (220, 220, 220)
 COR_TEXTO = (240, 240, 240)
@@ -47,121 +83,35 @@ FONTE_P = None
 # ==========================
 # ENTIDADES
 # ==========================
-class Raquete:
-    def __init__(self, x, y, largura=14, altura=100, velocidade=420):
-        self.rect = pygame.Rect(x, y, largura, altura)
-        self.vel = velocidade
-
-    def mover(self, direcao, dt):
-        # direcao: -1 cima / +1 baixo / 0 parado
-        self.rect.y += int(self.vel * direcao * dt)
-        if self.rect.top < 0:
-            self.rect.top = 0
-        if self.rect.bottom > ALTURA:
-            self.rect.bottom = ALTURA
+class Raquete(RaqueteSim):
+    """Raquete desenhável; a física fica em simulacao.RaqueteSim."""
+
+    @property
+    def rect(self): return pygame.Rect(self.x, self.y, self.largura, self.altura)
 
     def desenhar(self, tela):
         pygame.draw.rect(tela, COR_LINHAS, self.rect, border_radius=4)
 
 
-class Bola:
-    def __init__(self, x, y, raio=9, vel_inicial=420):
-        self.x = float(x)
-        self.y = float(y)
-        self.raio = raio
-        self.vel = vel_inicial
-        # Direção inicial ligeiramente inclinada
-        ang = random.uniform(-0.35, 0.35)
-        self.dirx = 1.0 * math.cos(ang)
-        self.diry = math.sin(ang)
-
-        self.incremento_vel = 24
-        self.vel_max = 1000
-        self.angulo_max = math.radians(60)
-
-    def _normalize(self):
-        m = math.hypot(self.dirx, self.diry)
-        if m == 0:
-            self.dirx, self.diry = 1.0, 0.0
-        else:
-            self.dirx /= m
-            self.diry /= m
-
-    def resetar(self, lado=1):
-        self.x = LARGURA / 2
-        self.y = ALTURA / 2
-        self.vel = 420
-        self.dirx = 1.0 * lado
-        self.diry = random.choice([-0.25, 0.25])
-        self._normalize()
-
-    def mover(self, dt):
-        self.x += self.dirx * self.vel * dt
-        self.y += self.diry * self.vel * dt
-
-        # colisão vertical
-        if self.top <= 0:
-            self.y = self.raio
-            self.diry *= -1
-        elif self.bottom >= ALTURA:
-            self.y = ALTURA - self.raio
-            self.diry *= -1
+class Bola(BolaSim):
+    """Bola desenhável; a física fica em simulacao.BolaSim."""
 
-    @property
-    def left(self): return self.x - self.raio
-    @property
-    def right(self): return self.x + self.raio
-    @property
-    def top(self): return self.y - self.raio
-    @property
-    def bottom(self): return self.y + self.raio
     @property
     def rect(self): return pygame.Rect(int(self.left), int(self.top), self.raio*2, self.raio*2)
 
     def desenhar(self, tela):
         pygame.draw.circle(tela, COR_LINHAS, (int(self.x), int(self.y)), self.raio)
 
-    def colide_com_raquete(self, rq: Raquete, eh_esquerda: bool):
-        if self.rect.colliderect(rq.rect):
-            # ponto de contato relativo
-            centro = rq.rect.centery
-            relativo = (self.y - centro) / (rq.rect.height / 2)
-            relativo = max(-1.0, min(1.0, relativo))
-            ang = relativo * self.angulo_max
-            self.dirx = math.cos(ang)
-            self.diry = math.sin(ang)
-            self.dirx = abs(self.dirx)
-            if not eh_esquerda:
-                self.dirx *= -1
-            self._normalize()
-
-            # empurra para fora
-            if eh_esquerda:
-                self.x = rq.rect.right + self.raio + 1
-            else:
-                self.x = rq.rect.left - self.raio - 1
-
-            self.vel = min(self.vel + self.incremento_vel, self.vel_max)
-            return True
-        return False
-
 # ==========================
 # JOGO BASE
 # ==========================
-class JogoPong:
-    def __init__(self):
-        margem = 36
-        self.raq_esq = Raquete(margem, ALTURA//2 - 50)
-        self.raq_dir = Raquete(LARGURA - margem - 14, ALTURA//2 - 50)
-        self.bola = Bola(LARGURA/2, ALTURA/2)
-        self.placar_esq = 0
-        self.placar_dir = 0
-        self.pausado = False
-
-    def reiniciar_round(self, quem_marco: str):
-        # quem_marco: "esq" ou "dir"
-        lado = -1 if quem_marco == "esq" else 1
-        self.bola.resetar(lado)
+class JogoPong(JogoPongSim):
+    """
+    JogoPongSim + desenho com pygame. O treino headless usa JogoPongSim
+    diretamente (sem pygame.Rect no loop interno).
+    """
+    _Raquete = Raquete
+    _Bola = Bola
 
     def _desenhar_campo(self, tela):
         tela.fill(COR_FUNDO)
@@ -186,35 +136,6 @@ class JogoPong:
                 tela.blit(t, (LARGURA//2 - t.get_width()//2, y))
                 y += 22
 
-    def step(self, dt, ctrl_esq: Callable[[dict], int], ctrl_dir: Callable[[dict], int]):
-        # controladores retornam -1/0/+1 com base no estado
-        estado = {
-            "ball_x": self.bola.x,
-            "ball_y": self.bola.y,
-            "ball_vx": self.bola.dirx * self.bola.vel,
-            "ball_vy": self.bola.diry * self.bola.vel,
-            "left_y": self.raq_esq.rect.centery,
-            "right_y": self.raq_dir.rect.centery,
-        }
-        self.raq_esq.mover(ctrl_esq(estado), dt)
-        self.raq_dir.mover(ctrl_dir(estado), dt)
-
-        self.bola.mover(dt)
-        col_esq = self.bola.colide_com_raquete(self.raq_esq, True)
-        col_dir = self.bola.colide_com_raquete(self.raq_dir, False)
-
-        ponto = None
-        if self.bola.right < 0:
-            self.placar_dir += 1
-            self.reiniciar_round("dir")
-            ponto = "dir"
-        elif self.bola.left > LARGURA:
-            self.placar_esq += 1
-            self.reiniciar_round("esq")
-            ponto = "esq"
-
-        return col_esq, col_dir, ponto
-
     def desenhar(self, tela, extra=None):
         self._desenhar_campo(tela)
         self.raq_esq.desenhar(tela)
@@ -223,106 +144,258 @@ class JogoPong:
         self._ui(tela, extra_lines=extra)
         pygame.display.flip()
 
-    def reset_placar(self):
-        self.placar_dir = 0
-        self.placar_esq = 0
-        self.reiniciar_round("dir")
-
 # ==========================
 # CONTROLADORES
 # ==========================
-def ctrl_humano_esquerda(estado):
+# Controladores recebem a simulacao.Observacao do jogo (preenchida no
+# lugar a cada passo) e retornam -1/0/+1. Controladores antigos, que
+# esperam um dict, podem ser usados com controlador_de_dict.
+def ctrl_humano_esquerda(obs):
     keys = pygame.key.get_pressed()
     d = 0
     if keys[pygame.K_w]: d -= 1
     if keys[pygame.K_s]: d += 1
     return d
 
-def ctrl_humano_direita(estado):
+def ctrl_humano_direita(obs):
     keys = pygame.key.get_pressed()
     d = 0
     if keys[pygame.K_UP]: d -= 1
     if keys[pygame.K_DOWN]: d += 1
     return d
 
-def ctrl_ai_heuristico(lag=0.0, erro=0.0, lado="dir"):
+def ctrl_ai_heuristico(lag=0.0, erro=0.0, lado="dir", rng=None):
     # IA simples que segue a bola com pequena latência/ruído
-    alvo = {"dir": "ball_y", "esq": "ball_y"}[lado]
-    acumulador = {"y": 0.0}
-    def _ctrl(estado):
-        y_target = estado[alvo] + random.uniform(-erro, erro)
+    # rng: random.Random do ruído (None = módulo random global)
+    rng = rng if rng is not None else random
+    eh_dir = lado == "dir"
+    acumulador = 0.0
+    def _ctrl(obs):
+        nonlocal acumulador
+        y_target = obs.ball_y + rng.uniform(-erro, erro)
         # simular lag: aproxima o alvo gradualmente
-        acumulador["y"] = (1 - lag) * acumulador.get("y", y_target) + lag * y_target
-        paddle_y = estado["right_y"] if lado == "dir" else estado["left_y"]
-        if paddle_y < acumulador["y"] - 8: return +1
-        if paddle_y > acumulador["y"] + 8: return -1
+        acumulador = (1 - lag) * acumulador + lag * y_target
+        paddle_y = obs.right_y if eh_dir else obs.left_y
+        if paddle_y < acumulador - 8: return +1
+        if paddle_y > acumulador + 8: return -1
         return 0
     return _ctrl
 
-def ctrl_por_rede(neural_net, lado="dir"):
+def repetir_acao(ctrl, intervalo: int):
+    """
+    Consulta ctrl só a cada `intervalo` frames (o primeiro inclusive) e
+    repete a última ação entre as consultas (action repeat/frame skip).
+    """
+    if intervalo <= 1:
+        return ctrl
+    frame = 0
+    acao = 0
+
+    def _ctrl(obs):
+        nonlocal frame, acao
+        if frame == 0:
+            acao = ctrl(obs)
+        frame += 1
+        if frame == intervalo:
+            frame = 0
+        return acao
+    return _ctrl
+
+def ctrl_por_rede(neural_net, lado="dir", intervalo: Optional[int] = None,
+                  dt: Optional[float] = None):
     """
     Controlador baseado em rede neural.
     Usa 8 inputs e 3 outputs (cima, parado, baixo).
+    A lista de inputs é reaproveitada entre frames; com RedeCompilada o
+    argmax sai direto de indice_max, sem lista de saídas.
+    intervalo: passos entre consultas à rede (None = o intervalo de
+    decisão salvo com a rede, convertido para passos de dt com o passo do
+    treino dela: redes.intervalo_em_passos; ver repetir_acao).
+    dt: passo da simulação em que o controlador joga (None = 1/FPS).
     """
-    def _norm(v, lo, hi):
-        return (v - lo) / (hi - lo) * 2 - 1.0
+    eh_dir = lado == "dir"
+    inputs = [0.0] * 8
+    indice_max = getattr(neural_net, "indice_max", None)
+
+    def _ctrl(obs):
+        # normalização para [-1, 1]: (v - lo) / (hi - lo) * 2 - 1
+        ball_x = obs.ball_x
+        ball_vx = obs.ball_vx
+        paddle_y = obs.right_y if eh_dir else obs.left_y
 
-    def _ctrl(estado):
         # Inputs originais (5)
-        bx = _norm(estado["ball_x"], 0, LARGURA)
-        by = _norm(estado["ball_y"], 0, ALTURA)
-        vx = _norm(estado["ball_vx"], -1000, 1000)
-        vy = _norm(estado["ball_vy"], -1000, 1000)
-        py = _norm(
-            estado["right_y"] if lado == "dir" else estado["left_y"],
-            0, ALTURA
-        )
-
-        # Novos inputs (3)
-        paddle_y = estado["right_y"] if lado == "dir" else estado["left_y"]
-        dist_y_norm = by - py
-        
-        if lado == "dir":
-            dist_x = _norm(LARGURA - estado["ball_x"], 0, LARGURA)
+        bx = ball_x / LARGURA * 2 - 1.0
+        by = obs.ball_y / ALTURA * 2 - 1.0
+        py = paddle_y / ALTURA * 2 - 1.0
+        inputs[0] = bx
+        inputs[1] = by
+        inputs[2] = (ball_vx + 1000) / 2000 * 2 - 1.0
+        inputs[3] = (obs.ball_vy + 1000) / 2000 * 2 - 1.0
+        inputs[4] = py
+
+        # Novos inputs (3): distância vertical, distância horizontal até
+        # a própria raquete e se a bola vem na minha direção
+        inputs[5] = by - py
+        if eh_dir:
+            inputs[6] = (LARGURA - ball_x) / LARGURA * 2 - 1.0
+            inputs[7] = 1.0 if ball_vx > 0 else -1.0
         else:
-            dist_x = _norm(estado["ball_x"], 0, LARGURA)
-
-        direction_toward_me = 1.0 if (
-            (lado == "dir" and estado["ball_vx"] > 0) or
-            (lado == "esq" and estado["ball_vx"] < 0)
-        ) else -1.0
-
-        # 8 inputs total
-        inputs = [bx, by, vx, vy, py, dist_y_norm, dist_x, direction_toward_me]
+            inputs[6] = bx
+            inputs[7] = 1.0 if ball_vx < 0 else -1.0
 
         # 3 outputs com argmax
-        outputs = neural_net.activate(inputs)
-        max_idx = outputs.index(max(outputs))
-        
+        if indice_max is not None:
+            max_idx = indice_max(inputs)
+        else:
+            outputs = neural_net.activate(inputs)
+            max_idx = outputs.index(max(outputs))
+
         if max_idx == 0: return -1  # Cima
         if max_idx == 2: return +1  # Baixo
         return 0  # Parado
 
-    return _ctrl
+    if intervalo is None:
+        intervalo = intervalo_em_passos(neural_net, dt if dt is not None else 1.0 / FPS)
+    return repetir_acao(_ctrl, intervalo)
 
 
-def carregar_ctrl_adversario(config, lado_oposto: str, arquivo_pkl: str):
+# Cache de redes adversárias (local a cada processo/worker):
+# arquivo -> (mtime_ns, rede). Recarrega só quando o .pkl muda no disco
+# (do .rede ao lado, se atualizado; ver redes.carregar_rede_salva).
+_CACHE_ADVERSARIOS = {}
+
+
+def _rede_adversario(config, arquivo_pkl: str):
     """
-    Carrega adversário NEAT treinado ou retorna heurístico.
+    Retorna a rede do adversário salvo em arquivo_pkl, usando o cache do
+    processo enquanto o arquivo não for reescrito.
+    """
+    mtime = os.stat(arquivo_pkl).st_mtime_ns
+    em_cache = _CACHE_ADVERSARIOS.get(arquivo_pkl)
+    if em_cache is not None and em_cache[0] == mtime:
+        return em_cache[1]
+
+    net = carregar_rede_salva(arquivo_pkl, config)
+    _CACHE_ADVERSARIOS[arquivo_pkl] = (mtime, net)
+    return net
+
+
+def invalidar_cache_adversarios(arquivo_pkl: Optional[str] = None):
+    """
+    Descarta a rede em cache de arquivo_pkl (ou todas, se None).
+    """
+    if arquivo_pkl is None:
+        _CACHE_ADVERSARIOS.clear()
+    else:
+        _CACHE_ADVERSARIOS.pop(arquivo_pkl, None)
+
+
+def _pacote_adversarios(config=None):
+    """
+    Caminhos de ARQ_IA_1/ARQ_IA_2 e {arquivo: (mtime_ns, rede no formato
+    .rede)} dos adversários salvos, publicados aos workers junto com a
+    config (ver paralelo.AvaliadorPersistente).
+    config só é necessária para adversários ainda sem .rede.
+    """
+    redes = {}
+    for arquivo in (ARQ_IA_1, ARQ_IA_2):
+        if os.path.exists(arquivo):
+            try:
+                mtime = os.stat(arquivo).st_mtime_ns
+                redes[arquivo] = (mtime, rede_para_bytes(_rede_adversario(config, arquivo)))
+            except Exception:
+                pass
+    return {"arquivos": (ARQ_IA_1, ARQ_IA_2), "redes": redes, "hall": dict(_HALL),
+            "intervalo": INTERVALO_DECISAO, "passo": PASSO_TREINO,
+            "parada": PARADA_TREINO.criterios if PARADA_TREINO is not None else None,
+            "contexto": contexto_avaliacao()}
+
+
+def receber_adversarios(config, adversarios):
+    """
+    Roda em cada worker ao receber uma nova versão do broadcast: preenche
+    o cache com as redes publicadas, sem ler os .pkl do disco. Os
+    caminhos, o intervalo de decisão, o passo do treino, a parada
+    antecipada e o contexto das sementes vêm junto (--out da CLI muda
+    ARQ_IA_*; workers criados por spawn só veriam os padrões).
+    """
+    global ARQ_IA_1, ARQ_IA_2, INTERVALO_DECISAO, PASSO_TREINO, PARADA_TREINO, CONTEXTO_TREINO
+    ARQ_IA_1, ARQ_IA_2 = adversarios["arquivos"]
+    INTERVALO_DECISAO = adversarios["intervalo"]
+    PASSO_TREINO = adversarios["passo"]
+    # contadores próprios do worker: voltam por parallel_wrapper_parada
+    criterios = adversarios["parada"]
+    PARADA_TREINO = ParadaAntecipada(*criterios) if criterios is not None else None
+    CONTEXTO_TREINO = adversarios["contexto"]
+    for arquivo, (mtime, dados) in adversarios["redes"].items():
+        _CACHE_ADVERSARIOS[arquivo] = (mtime, rede_de_bytes(dados))
+    usar_hall_da_fama(adversarios["hall"])
+
+
+def _rede_adversario_opcional(config, arquivo_pkl: str):
+    """
+    Rede do adversário (do cache), ou None se o arquivo não existir ou
+    não puder ser carregado.
     """
     if os.path.exists(arquivo_pkl):
         try:
-            with open(arquivo_pkl, "rb") as f:
-                campeao = pickle.load(f)
-            net_adversario = neat.nn.FeedForwardNetwork.create(campeao, config)
-            return ctrl_por_rede(net_adversario, lado=lado_oposto), "NEAT"
+            return _rede_adversario(config, arquivo_pkl)
         except Exception:
             pass
+    return None
+
+
+# Hall da fama em uso na avaliação, pelo lado em que o adversário joga
+# ("esq" = campeões da IA_1, "dir" = da IA_2): [(id, rede em bytes)].
+# Com entradas, cada trial enfrenta um campeão antigo sorteado com
+# probabilidade 1 - prob_atual (senão, o atual). As redes são compiladas
+# na primeira vez que saem no sorteio e guardadas por (lado, id).
+_HALL = {"esq": [], "dir": [], "prob_atual": 0.5}
+_CACHE_HALL = {}
+
+
+def usar_hall_da_fama(hall: dict):
+    """
+    Define o hall da fama da avaliação neste processo (no principal e,
+    via receber_adversarios, em cada worker). Redes que saíram do hall
+    deixam o cache; as que continuam não são recompiladas.
+    """
+    _HALL.update(hall)
+    ativos = {(lado, id_) for lado in ("esq", "dir") for id_, _ in _HALL[lado]}
+    for chave in list(_CACHE_HALL):
+        if chave not in ativos:
+            del _CACHE_HALL[chave]
+
+
+def _rede_hall(lado: str, rng: random.Random):
+    """Campeão antigo sorteado para o lado (ou None = usar o atual)."""
+    entradas = _HALL[lado]
+    if not entradas or rng.random() < _HALL["prob_atual"]:
+        return None
+    id_, dados = entradas[rng.randrange(len(entradas))]
+    rede = _CACHE_HALL.get((lado, id_))
+    if rede is None:
+        rede = _CACHE_HALL[(lado, id_)] = rede_de_bytes(dados)
+    return rede
+
+
+def carregar_ctrl_adversario(config, lado_oposto: str, arquivo_pkl: str, rng=None,
+                             dt: Optional[float] = None):
+    """
+    Carrega adversário NEAT treinado ou retorna heurístico.
+    A rede vem do cache do processo (ver _rede_adversario).
+    rng: random.Random para sortear/alimentar o heurístico.
+    dt: passo da simulação (para o intervalo de decisão da rede; ver ctrl_por_rede).
+    """
+    net_adversario = _rede_adversario_opcional(config, arquivo_pkl)
+    if net_adversario is not None:
+        return ctrl_por_rede(net_adversario, lado=lado_oposto, dt=dt), "NEAT"
 
     # Fallback heurístico
-    lag = random.uniform(0.15, 0.35)
-    erro = random.uniform(6, 14)
-    return ctrl_ai_heuristico(lag=lag, erro=erro, lado=lado_oposto), "HEURISTICA"
+    rng = rng if rng is not None else random
+    lag = rng.uniform(0.15, 0.35)
+    erro = rng.uniform(6, 14)
+    return ctrl_ai_heuristico(lag=lag, erro=erro, lado=lado_oposto, rng=rng), "HEURISTICA"
 
 # ==========================
 # MENU
@@ -377,7 +450,8 @@ def jogar(modo: str, rede_campeao: Optional[neat.nn.FeedForwardNetwork] = None):
     elif modo == MODO_HAI:
         ctrl_esq = ctrl_humano_esquerda
         # Carrega IA_2 para o lado direito
-        rede_ia2 = carregar_rede_campeao(os.path.join(os.path.dirname(__file__), "config-neat.txt"), ARQ_IA_2)
+        rede_ia2 = carregar_rede_campeao(os.path.join(os.path.dirname(__file__), "config-neat.txt"), ARQ_IA_2,
+                                         compilada=True)
         if rede_ia2:
             ctrl_dir = ctrl_por_rede(rede_ia2, "dir")
             overlay = ["Modo: Humano vs IA_2 (NEAT)", "IA_treinada_2.pkl carregada ✔"]
@@ -388,8 +462,8 @@ def jogar(modo: str, rede_campeao: Optional[neat.nn.FeedForwardNetwork] = None):
     elif modo == MODO_AIAI:
         # Carrega IA_1 (esquerda) e IA_2 (direita)
         caminho_cfg = os.path.join(os.path.dirname(__file__), "config-neat.txt")
-        rede_ia1 = carregar_rede_campeao(caminho_cfg, ARQ_IA_1)
-        rede_ia2 = carregar_rede_campeao(caminho_cfg, ARQ_IA_2)
+        rede_ia1 = carregar_rede_campeao(caminho_cfg, ARQ_IA_1, compilada=True)
+        rede_ia2 = carregar_rede_campeao(caminho_cfg, ARQ_IA_2, compilada=True)
         
         if rede_ia1 and rede_ia2:
             ctrl_esq = ctrl_por_rede(rede_ia1, "esq")
@@ -424,14 +498,150 @@ def jogar(modo: str, rede_campeao: Optional[neat.nn.FeedForwardNetwork] = None):
 # TREINAMENTO NEAT
 # ==========================
 geracao = 0
+# geração corrente do neat (pop.generation), semente da avaliação em lote
+geracao_neat = 0
+
+
+class ReporterGeracao(neat.reporting.BaseReporter):
+    """Mantém geracao_neat em dia para a avaliação em lote."""
+
+    def start_generation(self, generation):
+        global geracao_neat
+        geracao_neat = generation
+
+
+class ReporterMelhor(neat.reporting.BaseReporter):
+    """
+    Melhor genoma da última geração avaliada. pop.best_genome é o melhor
+    de todas as gerações, que na co-evolução enfrentou outros adversários.
+    """
+
+    def __init__(self):
+        self.melhor = None
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.melhor = best_genome
+
+
+def contexto_avaliacao() -> str:
+    """
+    Resumo (hash) de tudo o que, além do genoma, define a fitness:
+    conteúdo dos adversários salvos, ids do hall da fama em uso,
+    intervalo de decisão e passo do treino. Entra na semente dos trials e
+    na chave do cache de fitness (_com_cache).
+    """
+    hall = (tuple(id_ for id_, _ in _HALL["esq"]), tuple(id_ for id_, _ in _HALL["dir"]),
+            _HALL["prob_atual"])
+    partes = (hash_arquivo(ARQ_IA_1), hash_arquivo(ARQ_IA_2), hall, INTERVALO_DECISAO, PASSO_TREINO)
+    return hashlib.blake2b(repr(partes).encode(), digest_size=8).hexdigest()
+
+
+def semente_trial(contexto: str, estrutura: bytes, trial: int) -> str:
+    """
+    Semente do trial (contexto dos adversários, hash estrutural do genoma,
+    trial). random.Random(str) usa SHA-512 da string: mesmo valor em
+    qualquer processo/máquina, e clones/elites com os mesmos adversários
+    jogam os mesmos trials.
+    """
+    return f"pong:{contexto}:{estrutura.hex()}:{trial}"
+
+
+class ParadaAntecipada:
+    """
+    Critérios para encerrar cedo um trial perdido (só no modo headless):
+      - pontos_contra_seguidos: K gols sofridos em sequência sem nenhuma
+        rebatida da raquete controlada no trial
+      - piso_fitness: fitness do trial chegou a esse valor (None = desligado)
+
+    O restante do trial é extrapolado linearmente pela taxa de fitness por
+    passo até ali, mantendo a ordem entre genomas ruins. Também acumula
+    quantos passos foram economizados (ver medir_parada_antecipada).
+    """
+
+    def __init__(self, pontos_contra_seguidos: Optional[int] = 2,
+                 piso_fitness: Optional[float] = None):
+        self.pontos_contra_seguidos = pontos_contra_seguidos
+        self.piso_fitness = piso_fitness
+        self.trials = 0
+        self.trials_encerrados = 0
+        self.passos_executados = 0
+        self.passos_orcamento = 0
+
+    def deve_parar(self, fit: float, contra_seguidos: int, rebateu: bool) -> bool:
+        if (self.pontos_contra_seguidos is not None and not rebateu
+                and contra_seguidos >= self.pontos_contra_seguidos):
+            return True
+        return self.piso_fitness is not None and fit <= self.piso_fitness
+
+    def registrar(self, passos: int, max_steps: int, encerrado: bool):
+        self.trials += 1
+        self.trials_encerrados += encerrado
+        self.passos_executados += passos
+        self.passos_orcamento += max_steps
 
-def avaliar_genoma(genome, config, render=False, tempo_max=5.0):
+    @property
+    def criterios(self) -> tuple:
+        """(pontos_contra_seguidos, piso_fitness): refaz a parada em outro processo."""
+        return self.pontos_contra_seguidos, self.piso_fitness
+
+    def contadores(self) -> tuple:
+        return self.trials, self.trials_encerrados, self.passos_executados, self.passos_orcamento
+
+    def somar(self, contadores):
+        """Acumula contadores vindos de outro processo (ver avaliar_no_pool)."""
+        trials, encerrados, executados, orcamento = (int(c) for c in contadores)
+        self.trials += trials
+        self.trials_encerrados += encerrados
+        self.passos_executados += executados
+        self.passos_orcamento += orcamento
+
+    def resumo(self) -> str:
+        economia = 1.0 - self.passos_executados / max(1, self.passos_orcamento)
+        return (f"Parada antecipada: {self.trials_encerrados}/{self.trials} trials encerrados, "
+                f"{100 * economia:.1f}% dos passos economizados")
+
+
+def avaliar_genoma(genome, config, render=False, tempo_max=5.0, max_steps=None,
+                   contexto: Optional[str] = None, parada: Optional[ParadaAntecipada] = None,
+                   indices_trials: Optional[Sequence[int]] = None,
+                   intervalo_decisao: Optional[int] = None, dt: Optional[float] = None):
     """
     Avalia o genoma em múltiplos trials curtos:
       - controla À DIREITA e À ESQUERDA
       - serve começando dos dois lados
       - adversário heurístico com lag/erro variados
 
+    Duração de cada trial:
+      - render=True: tempo real (tempo_max segundos de relógio)
+      - render=False: max_steps passos de dt (padrão: tempo_max / dt),
+        independente da velocidade/carga da máquina
+
+    dt: passo headless em segundos (None = PASSO_TREINO, 1/FPS). Passos
+    maiores usam colisão contínua (JogoPongSim varredura=True) e os
+    termos por passo do shaping são escalados por dt * FPS, então a
+    fitness continua na mesma escala com metade dos passos a 1/30.
+
+    Cada trial usa seu próprio random.Random semeado por (contexto, hash
+    estrutural do genoma, trial): a mesma estrutura contra os mesmos
+    adversários tem a mesma fitness em qualquer geração e processo,
+    sequencial ou paralelo, com qualquer genome.key (o que o cache de
+    fitness pressupõe). contexto: None = contexto_avaliacao().
+
+    parada: critérios de parada antecipada (ParadaAntecipada) para trials
+    já perdidos; None roda sempre o orçamento completo.
+
+    Com hall da fama (usar_hall_da_fama), o adversário de cada trial pode
+    ser um campeão antigo sorteado pela mesma semente: o custo por genoma
+    não muda com o tamanho do hall.
+
+    indices_trials: roda só esses trials (0..3, ver abaixo) e devolve a
+    média deles; a semente de cada trial não depende de quais rodam.
+
+    intervalo_decisao: a rede do genoma é consultada a cada k passos e a
+    ação se repete entre as consultas (None = INTERVALO_DECISAO). Os
+    adversários salvos usam o intervalo gravado com eles, no tempo de jogo
+    do treino deles (ver ctrl_por_rede).
+
     Shaping (por trial):
       +2.5 por rebatida (defesa)
       +3.0 por ponto a favor
@@ -441,13 +651,28 @@ def avaliar_genoma(genome, config, render=False, tempo_max=5.0):
 
     Retorna a média dos trials.
     """
-    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    # rede compilada: mesmas saídas da FeedForwardNetwork, ativação mais barata
+    net = RedeCompilada.create(genome, config)
+    if dt is None:
+        dt = PASSO_TREINO
+    if max_steps is None:
+        max_steps = int(round(tempo_max / dt))
+    varredura = dt > 1.0 / FPS
+    # termos por passo valem o mesmo por segundo de jogo (1.0 a 1/FPS)
+    escala = dt * FPS
+    sobrevivencia = 0.01 * escala
+    custo_distancia = 0.003 * escala
+    if intervalo_decisao is None:
+        intervalo_decisao = INTERVALO_DECISAO
+    # passo em que os adversários jogam (com render, frames de ~1/FPS)
+    dt_adv = 1.0 / FPS if render else dt
 
     def _ctrl_by_net(lado):
-        return ctrl_por_rede(net, lado=lado)
+        return ctrl_por_rede(net, lado=lado, intervalo=intervalo_decisao)
 
-    def _trial(lado_ctrl: str, serve_para: str) -> float:
-        jogo = JogoPong()
+    def _trial(lado_ctrl: str, serve_para: str, rng: random.Random, rng_hall: random.Random) -> float:
+        # headless usa o núcleo sem pygame; só o render precisa de JogoPong
+        jogo = JogoPong(rng) if render else JogoPongSim(rng, varredura)
         jogo.reset_placar()
         # força o primeiro saque para um lado
         jogo.reiniciar_round("esq" if serve_para == "esq" else "dir")
@@ -460,8 +685,14 @@ def avaliar_genoma(genome, config, render=False, tempo_max=5.0):
             lado_adv = "dir"
             arquivo_adv = ARQ_IA_2  # Adversário direito
 
-        # Carrega o adversário (NEAT trained ou heurístico)
-        ctrl_adversario, nome_adv = carregar_ctrl_adversario(config, lado_adv, arquivo_adv)
+        # Carrega o adversário: campeão antigo do hall da fama (se sorteado),
+        # senão o atual (NEAT trained ou heurístico)
+        net_hall = _rede_hall(lado_adv, rng_hall)
+        if net_hall is not None:
+            ctrl_adversario, nome_adv = ctrl_por_rede(net_hall, lado=lado_adv, dt=dt_adv), "HALL"
+        else:
+            ctrl_adversario, nome_adv = carregar_ctrl_adversario(config, lado_adv, arquivo_adv, rng=rng,
+                                                                 dt=dt_adv)
 
         # Atribui controladores
         if lado_ctrl == "dir":
@@ -472,11 +703,14 @@ def avaliar_genoma(genome, config, render=False, tempo_max=5.0):
             ctrl_dir = ctrl_adversario
 
         inicio = time.time()
+        passos = 0
         fit = 0.0
+        contra_seguidos = 0
+        rebateu = False
 
         while True:
             if render:
-                dt = CLOCK.tick(FPS) / 1000.0
+                dt_frame = CLOCK.tick(FPS) / 1000.0
                 for e in pygame.event.get():
                     if e.type == pygame.QUIT:
                         pygame.quit(); sys.exit()
@@ -485,47 +719,64 @@ def avaliar_genoma(genome, config, render=False, tempo_max=5.0):
                         raise KeyboardInterrupt
             else:
                 # Modo rápido: timestep fixo, SEM pygame
-                dt = 1.0 / 60.0
+                dt_frame = dt
 
-            col_esq, col_dir, ponto = jogo.step(dt, ctrl_esq, ctrl_dir)
+            col_esq, col_dir, ponto = jogo.step(dt_frame, ctrl_esq, ctrl_dir)
 
             # sobrevivência (bem pequeno agora)
-            fit += 0.01
+            fit += sobrevivencia
 
             # RECOMPENSA DEFESA (contato da RAQUETE controlada)
             if lado_ctrl == "dir" and col_dir:
                 fit += 2.5
+                rebateu = True
             if lado_ctrl == "esq" and col_esq:
                 fit += 2.5
+                rebateu = True
 
             # PONTUAÇÃO
             if lado_ctrl == "dir":
                 if ponto == "dir":  # ponto a favor
                     fit += 3.0
+                    contra_seguidos = 0
                 elif ponto == "esq":  # tomou gol
                     fit -= 8.0
+                    contra_seguidos += 1
             else:  # controla a esquerda
                 if ponto == "esq":
                     fit += 3.0
+                    contra_seguidos = 0
                 elif ponto == "dir":
                     fit -= 8.0
+                    contra_seguidos += 1
 
             # CUSTO DE DISTÂNCIA quando a bola VEM para o seu lado
             vem_para_dir = jogo.bola.dirx > 0
             vem_para_esq = jogo.bola.dirx < 0
             if lado_ctrl == "dir" and vem_para_dir and jogo.bola.x > LARGURA * 0.5:
-                dy = abs(jogo.raq_dir.rect.centery - jogo.bola.y) / (ALTURA / 2)
-                fit -= 0.003 * dy  # pequeno, por frame
+                dy = abs(jogo.raq_dir.centery - jogo.bola.y) / (ALTURA / 2)
+                fit -= custo_distancia * dy  # pequeno, por frame
             if lado_ctrl == "esq" and vem_para_esq and jogo.bola.x < LARGURA * 0.5:
-                dy = abs(jogo.raq_esq.rect.centery - jogo.bola.y) / (ALTURA / 2)
-                fit -= 0.003 * dy
+                dy = abs(jogo.raq_esq.centery - jogo.bola.y) / (ALTURA / 2)
+                fit -= custo_distancia * dy
 
-            if time.time() - inicio > tempo_max:
+            passos += 1
+            if render:
+                if time.time() - inicio > tempo_max:
+                    break
+            elif passos >= max_steps:
+                # orçamento em passos: termina assim que a CPU permitir
                 break
+            elif parada is not None and parada.deve_parar(fit, contra_seguidos, rebateu):
+                # trial perdido: extrapola o resto pela taxa até aqui
+                parada.registrar(passos, max_steps, True)
+                return fit * max_steps / passos
 
             if render:
                 jogo.desenhar(TELA, extra=[f"Treino • Geração {geracao}", f"Fitness: {fit:.2f}"])
 
+        if parada is not None and not render:
+            parada.registrar(passos, max_steps, False)
         return fit
 
     # 4 trials: controla dir/esq × serve dir/esq
@@ -535,31 +786,211 @@ def avaliar_genoma(genome, config, render=False, tempo_max=5.0):
         ("esq", "dir"),
         ("esq", "esq"),
     ]
+    if indices_trials is None:
+        indices_trials = range(len(trials))
+    if contexto is None:
+        contexto = contexto_avaliacao()
+    estrutura = hash_genoma(genome)
     total = 0.0
-    for lado, serve in trials:
-        total += _trial(lado, serve)
+    for i in indices_trials:
+        lado, serve = trials[i]
+        semente = semente_trial(contexto, estrutura, i)
+        # sorteio do hall num gerador à parte: sem hall, nada muda no trial
+        total += _trial(lado, serve, random.Random(semente), random.Random(semente + ":hall"))
 
-    return total / len(trials)
+    return total / len(indices_trials)
 
 
-def parallel_wrapper(genome, config_passed):
+def medir_parada_antecipada(genomas, config, parada: ParadaAntecipada,
+                            contexto: Optional[str] = None) -> dict:
+    """
+    Avalia `genomas` com e sem parada antecipada e mede a fidelidade:
+    correlação de ranking (Spearman), erro médio de fitness, quantos dos
+    10 melhores coincidem e fração de passos economizada.
+    """
+    import numpy as np
+    completa, cedo = [], []
+    for g in genomas:
+        completa.append(avaliar_genoma(g, config, contexto=contexto))
+        cedo.append(avaliar_genoma(g, config, contexto=contexto, parada=parada))
+    completa, cedo = np.array(completa), np.array(cedo)
+
+    rank_c = np.argsort(np.argsort(completa))
+    rank_p = np.argsort(np.argsort(cedo))
+    top = min(10, len(genomas))
+    return {
+        "genomas": len(genomas),
+        "spearman": float(np.corrcoef(rank_c, rank_p)[0, 1]) if len(genomas) > 1 else 1.0,
+        "erro_medio": float(np.mean(np.abs(completa - cedo))),
+        "top10_iguais": len(set(np.argsort(-completa)[:top]) & set(np.argsort(-cedo)[:top])),
+        "trials_encerrados": parada.trials_encerrados,
+        "trials": parada.trials,
+        "passos_economizados": 1.0 - parada.passos_executados / max(1, parada.passos_orcamento),
+    }
+
+
+# Parada antecipada usada no treino (None = trials completos)
+PARADA_TREINO: Optional[ParadaAntecipada] = None
+# Frames entre consultas à rede no treino (1 = todo frame); gravado nos
+# campeões salvos, que jogam com o mesmo intervalo
+INTERVALO_DECISAO = 1
+# Passo da simulação headless no treino; acima de 1/FPS a colisão é
+# contínua (simulacao.BolaSim.mover_varrido)
+PASSO_TREINO = 1.0 / FPS
+# contexto_avaliacao() do processo principal, recebido pelos workers no
+# broadcast (None = calcular aqui)
+CONTEXTO_TREINO: Optional[str] = None
+
+
+def parallel_wrapper(genome, config_passed, geracao_semente=0, indices_trials=None):
     """
     Wrapper para ParallelEvaluator - chamado por cada worker process.
     NÃO pode usar pygame/TELA (processos filhos não têm contexto gráfico).
+    geracao_semente: geração do neat (AvaliadorPersistente a repassa); as
+    sementes dos trials não dependem dela (ver avaliar_genoma).
+    indices_trials: subconjunto de trials (avaliação por corrida).
     """
-    fitness = avaliar_genoma(genome, config_passed, render=False)
+    fitness = avaliar_genoma(genome, config_passed, render=False,
+                             contexto=CONTEXTO_TREINO, parada=PARADA_TREINO,
+                             indices_trials=indices_trials)
     return fitness
 
 
+def parallel_wrapper_parada(genome, config_passed, geracao_semente=0, indices_trials=None):
+    """
+    parallel_wrapper que devolve também o que a parada antecipada do
+    worker contou neste genoma: [fitness, trials, encerrados, passos
+    executados, passos orçados] (ver avaliar_no_pool).
+    """
+    antes = PARADA_TREINO.contadores()
+    fitness = parallel_wrapper(genome, config_passed, geracao_semente, indices_trials)
+    return [fitness] + [d - a for d, a in zip(PARADA_TREINO.contadores(), antes)]
+
+
+def avaliar_no_pool(avaliador: AvaliadorPersistente, genomas, config, **kwargs):
+    """
+    Fitness de (id, genoma) no pool, na mesma ordem. Com PARADA_TREINO, os
+    contadores dos workers são somados aos dela no processo principal.
+    """
+    if PARADA_TREINO is None:
+        return avaliador.avaliar(genomas, config, **kwargs)
+    valores = avaliador.mapear(parallel_wrapper_parada, [g for _, g in genomas], config,
+                               por_item=5, **kwargs)
+    for i in range(0, len(valores), 5):
+        PARADA_TREINO.somar(valores[i + 1:i + 5])
+    return valores[::5]
+
+
+def jogar_partida(rede_esq, rede_dir, rng: random.Random, serve_para="dir", max_steps=None,
+                  tempo_max=5.0, intervalo_decisao: Optional[int] = None, dt: Optional[float] = None):
+    """
+    Uma partida headless entre duas redes; devolve (fitness esq, fitness dir).
+    Cada lado recebe o mesmo shaping de avaliar_genoma, na mesma ordem:
+    a fitness de um lado é a que ele teria num trial de avaliar_genoma
+    contra a outra rede com o mesmo rng.
+    intervalo_decisao: das duas redes, em passos de dt (None = o de cada
+    rede, ver ctrl_por_rede).
+    dt: passo (None = PASSO_TREINO), como em avaliar_genoma.
+    """
+    if dt is None:
+        dt = PASSO_TREINO
+    if max_steps is None:
+        max_steps = int(round(tempo_max / dt))
+    escala = dt * FPS
+    sobrevivencia = 0.01 * escala
+    custo_distancia = 0.003 * escala
+    jogo = JogoPongSim(rng, dt > 1.0 / FPS)
+    jogo.reset_placar()
+    jogo.reiniciar_round(serve_para)
+    ctrl_esq = ctrl_por_rede(rede_esq, lado="esq", intervalo=intervalo_decisao, dt=dt)
+    ctrl_dir = ctrl_por_rede(rede_dir, lado="dir", intervalo=intervalo_decisao, dt=dt)
+    bola, raq_esq, raq_dir = jogo.bola, jogo.raq_esq, jogo.raq_dir
+    meio = LARGURA * 0.5
+    fit_esq = fit_dir = 0.0
+
+    for _ in range(max_steps):
+        col_esq, col_dir, ponto = jogo.step(dt, ctrl_esq, ctrl_dir)
+        fit_esq += sobrevivencia
+        fit_dir += sobrevivencia
+        if col_esq:
+            fit_esq += 2.5
+        if col_dir:
+            fit_dir += 2.5
+        if ponto == "esq":
+            fit_esq += 3.0
+            fit_dir -= 8.0
+        elif ponto == "dir":
+            fit_dir += 3.0
+            fit_esq -= 8.0
+        if bola.dirx > 0 and bola.x > meio:
+            fit_dir -= custo_distancia * (abs(raq_dir.centery - bola.y) / (ALTURA / 2))
+        if bola.dirx < 0 and bola.x < meio:
+            fit_esq -= custo_distancia * (abs(raq_esq.centery - bola.y) / (ALTURA / 2))
+    return fit_esq, fit_dir
+
+
+# redes compiladas da geração em curso, por (lado, chave do genoma):
+# cada genoma joga várias partidas do lote (ver partida_wrapper)
+_REDES_PARTIDA = {"geracao": None, "redes": {}}
+
+
+def _rede_partida(genome, config, lado: str, geracao_semente: int):
+    if _REDES_PARTIDA["geracao"] != geracao_semente:
+        _REDES_PARTIDA["geracao"] = geracao_semente
+        _REDES_PARTIDA["redes"] = {}
+    rede = _REDES_PARTIDA["redes"].get((lado, genome.key))
+    if rede is None:
+        rede = _REDES_PARTIDA["redes"][(lado, genome.key)] = RedeCompilada.create(genome, config)
+    return rede
+
+
+def partida_wrapper(partida, config_passed, geracao_semente=0):
+    """
+    Partida da co-evolução simultânea (simultaneo.AvaliadorSimultaneo),
+    no worker ou no processo principal: partida = (genoma IA_1 à esquerda,
+    genoma IA_2 à direita, rodada). O saque alterna a cada rodada e a
+    semente é fixada por (geração, genomas, rodada).
+    """
+    g_esq, g_dir, rodada = partida
+    rng = random.Random(f"partida:{geracao_semente}:{g_esq.key}:{g_dir.key}:{rodada}")
+    return jogar_partida(_rede_partida(g_esq, config_passed, "esq", geracao_semente),
+                         _rede_partida(g_dir, config_passed, "dir", geracao_semente),
+                         rng, serve_para="dir" if rodada % 2 == 0 else "esq",
+                         intervalo_decisao=INTERVALO_DECISAO)
+
+
+def avaliar_trials_sequencial(genomas, config, indices_trials):
+    """
+    Avaliação parcial (só `indices_trials`) no processo atual, no formato
+    esperado por corrida.AvaliadorCorrida.
+    """
+    contexto = contexto_avaliacao()
+    return [avaliar_genoma(g, config, contexto=contexto, parada=PARADA_TREINO,
+                           indices_trials=indices_trials)
+            for _, g in genomas]
+
+
+def _progresso_terminal(geracao_atual, idx, total, elapsed, restante):
+    # uma linha reescrita no lugar, ~20 atualizações por geração
+    if idx != total and idx % max(1, total // 20):
+        return
+    barra = "#" * int(20 * idx / total)
+    fim = "\n" if idx == total else ""
+    print(f"\r   Geração {geracao_atual} [{barra:<20}] {idx}/{total} "
+          f"| {elapsed:5.1f}s | restante {restante:5.1f}s", end=fim, flush=True)
+
+
 def func_avaliacao(genomas, config):
     global geracao
     geracao += 1
 
     total = len(genomas)
     inicio_geracao = time.time()
+    contexto = contexto_avaliacao()
 
     for idx, (_, g) in enumerate(genomas, start=1):
-        g.fitness = avaliar_genoma(g, config, render=False)
+        g.fitness = avaliar_genoma(g, config, render=False, contexto=contexto,
+                                   parada=PARADA_TREINO)
 
         # --- Barra de progresso simples ---
         elapsed = time.time() - inicio_geracao
@@ -567,6 +998,11 @@ def func_avaliacao(genomas, config):
         est_total = elapsed / perc if perc > 0 else 0
         restante = max(0, est_total - elapsed)
 
+        if TELA is None:
+            # sem janela (CLI): progresso só no terminal
+            _progresso_terminal(geracao, idx, total, elapsed, restante)
+            continue
+
         # Atualiza a tela (sem travar o treino)
         TELA.fill((20, 20, 30))
         t1 = FONTE_M.render(f"Treinando geração {geracao}", True, (255, 255, 255))
@@ -589,6 +1025,35 @@ def func_avaliacao(genomas, config):
 
         pygame.display.flip()
 
+def func_avaliacao_lote(genomas, config, tempo_max=5.0):
+    """
+    Avalia a população inteira num único processo (lote.avaliar_lote):
+    as 4 × N partidas andam juntas num BatchPong e a inferência de cada
+    frame é uma única chamada em RedesLote. Mesmo shaping de
+    avaliar_genoma, sem pygame.
+    """
+    if PASSO_TREINO != 1.0 / FPS:
+        # o lote não tem colisão contínua nem o shaping escalado por dt
+        raise ValueError("avaliação em lote só com o passo padrão (1/FPS); "
+                         "use a avaliação por genoma com outro --dt")
+    # numpy só entra no processo que usa o modo em lote
+    import numpy as np
+    import lote
+
+    global geracao
+    geracao += 1
+
+    redes = lote.RedesLote.de_genomas([g for _, g in genomas], config)
+    fitness = lote.avaliar_lote(redes,
+                                rede_adv_esq=_rede_adversario_opcional(config, ARQ_IA_1),
+                                rede_adv_dir=_rede_adversario_opcional(config, ARQ_IA_2),
+                                max_steps=int(round(tempo_max * FPS)),
+                                dt=1.0 / FPS,
+                                intervalo_decisao=INTERVALO_DECISAO,
+                                rng=np.random.default_rng(geracao_neat))
+    for (_, g), f in zip(genomas, fitness):
+        g.fitness = float(f)
+
 def treinar_neat(caminho_config: str, geracoes=30, salvar_em="melhor_genoma.pkl"):
     config = neat.config.Config(neat.DefaultGenome,
                                 neat.DefaultReproduction,
@@ -599,15 +1064,16 @@ def treinar_neat(caminho_config: str, geracoes=30, salvar_em="melhor_genoma.pkl"
     pop = neat.Population(config)
     pop.add_reporter(neat.StdOutReporter(True))
     pop.add_reporter(neat.StatisticsReporter())
+    pop.add_reporter(ReporterGeracao())
+    pop.add_reporter(ReporterTempos("treino", destino=TEMPOS_GERACOES, arquivo=ARQ_TEMPOS))
 
     campeao = pop.run(func_avaliacao, geracoes)
 
-    # salva campeão
-    with open(ARQ_CAMPEAO, "wb") as f:
-        pickle.dump(campeao, f)
+    # salva campeão (+ rede pronta em .rede, de carga rápida)
+    _salvar_campeao(campeao, config, ARQ_CAMPEAO)
 
     # tenta exibir o campeão jogando
-    rede = neat.nn.FeedForwardNetwork.create(campeao, config)
+    rede = RedeCompilada.create(campeao, config)
     mostrar_campeao(rede, titulo="Treino concluído! Campeão em ação (ESC volta ao menu)")
 
 def mostrar_campeao(rede, titulo="Campeão (ESC para sair)"):
@@ -626,17 +1092,23 @@ def mostrar_campeao(rede, titulo="Campeão (ESC para sair)"):
         jogo.step(dt, ctrl_esq, ctrl_dir)
         jogo.desenhar(TELA, extra=[titulo])
 
-def carregar_rede_campeao(caminho_config: str, arquivo: str = ARQ_CAMPEAO):
-    if not os.path.exists(arquivo):
+def carregar_rede_campeao(caminho_config: str, arquivo: str = ARQ_CAMPEAO, compilada=False):
+    """
+    Carrega o genoma salvo e devolve sua rede (ou None se não existir).
+    compilada=True devolve uma RedeCompilada (activate gerado em Python,
+    mesmas saídas, bem mais rápida por frame).
+    Com um .rede atualizado ao lado, nem a config nem o genoma são lidos.
+    """
+    if not os.path.exists(arquivo) and not rede_atualizada(arquivo):
         return None
-    with open(arquivo, "rb") as f:
-        campeao = pickle.load(f)
-    config = neat.config.Config(neat.DefaultGenome,
-                                neat.DefaultReproduction,
-                                neat.DefaultSpeciesSet,
-                                neat.DefaultStagnation,
-                                caminho_config)
-    return neat.nn.FeedForwardNetwork.create(campeao, config)
+    config = None
+    if not rede_atualizada(arquivo):
+        config = neat.config.Config(neat.DefaultGenome,
+                                    neat.DefaultReproduction,
+                                    neat.DefaultSpeciesSet,
+                                    neat.DefaultStagnation,
+                                    caminho_config)
+    return carregar_rede_salva(arquivo, config, compilada)
 
 # ==========================
 # MAIN
@@ -659,15 +1131,78 @@ def main():
             jogar(modo, rede_campeao=None)
 
 
-def treinar_co_evolutivo(caminho_cfg: str, num_rodadas: int, geracoes_por_rodada: int):
+def _arquivos_campeoes():
+    return (("IA_1", ARQ_IA_1), ("IA_2", ARQ_IA_2), ("HALL_1", ARQ_HALL_1), ("HALL_2", ARQ_HALL_2))
+
+
+def _ler_campeoes() -> dict:
+    """Conteúdo atual dos arquivos das IAs e dos halls (vai no checkpoint)."""
+    campeoes = {}
+    for nome, arquivo in _arquivos_campeoes():
+        if os.path.exists(arquivo):
+            with open(arquivo, "rb") as f:
+                campeoes[nome] = f.read()
+    return campeoes
+
+
+def _restaurar_campeoes(campeoes: dict):
+    # volta as IAs ao estado do checkpoint (um lado pode ter terminado
+    # e salvo o campeão depois do último checkpoint)
+    for nome, arquivo in _arquivos_campeoes():
+        if nome in campeoes:
+            with open(arquivo + ".tmp", "wb") as f:
+                f.write(campeoes[nome])
+            os.replace(arquivo + ".tmp", arquivo)
+            invalidar_cache_adversarios(arquivo)
+        elif nome.startswith("HALL") and os.path.exists(arquivo):
+            # hall criado depois do checkpoint
+            os.remove(arquivo)
+
+
+def _publicar_halls(halls: dict):
+    # IA_1 joga à esquerda e IA_2 à direita (ver avaliar_genoma)
+    usar_hall_da_fama({"esq": halls[ARQ_IA_1].redes() if halls else [],
+                       "dir": halls[ARQ_IA_2].redes() if halls else []})
+
+
+def treinar_co_evolutivo(caminho_cfg: str, num_rodadas: int, geracoes_por_rodada: int,
+                         arquivo_checkpoint: Optional[str] = ARQ_CHECKPOINT, retomar=True,
+                         intervalo_checkpoint=1, num_workers: Optional[int] = None,
+                         tamanho_hall=200, corrida=False, em_lote=False):
     """
     Treinamento co-evolutivo com bootstrap.
+    Um único pool de workers (AvaliadorPersistente) atende todas as rodadas.
+
+    A cada intervalo_checkpoint gerações (e ao fim de cada lado) grava um
+    checkpoint em arquivo_checkpoint (None = desligado). Com retomar=True
+    e um checkpoint existente, continua da mesma rodada/lado/geração; o
+    arquivo é apagado quando o treinamento termina.
+    num_workers: processos de avaliação (None = nº de CPUs; 1 = sequencial).
+    tamanho_hall: campeões antigos guardados por IA em ARQ_HALL_1/2 e
+    sorteados como adversários (0 = só os campeões atuais).
+    corrida/em_lote: modo de avaliação de cada lado (ver _treinar_lado).
     """
     global geracao, TEMPOS_GERACOES
     
     TEMPOS_GERACOES.clear()
     geracao = 0
 
+    gravador = GravadorCheckpoint(arquivo_checkpoint) if arquivo_checkpoint else None
+    retomado = carregar_checkpoint(arquivo_checkpoint) if gravador is not None and retomar else None
+    inicio = (1, 0)
+    if retomado is not None:
+        inicio = (retomado["rodada"], retomado["lado"])
+        geracao = retomado["geracao"]
+        _restaurar_campeoes(retomado["campeoes"])
+        random.setstate(retomado["random"])
+
+    # hall da fama de cada IA, indexado pelo arquivo do seu campeão
+    halls = {}
+    if tamanho_hall > 0:
+        halls = {ARQ_IA_1: HallDaFama(ARQ_HALL_1, tamanho_hall),
+                 ARQ_IA_2: HallDaFama(ARQ_HALL_2, tamanho_hall)}
+    _publicar_halls(halls)
+
     # BOOTSTRAP DESABILITADO - Continua de onde parou!
     # (IAs atuais: IA_1 fitness ~13k, IA_2 fitness ~6k)
     # if os.path.exists(ARQ_CAMPEAO):
@@ -681,6 +1216,9 @@ def treinar_co_evolutivo(caminho_cfg: str, num_rodadas: int, geracoes_por_rodada
     print(f"\n🔄 Continuando treinamento de IAs existentes...")
     print(f"   IA_1: {os.path.basename(ARQ_IA_1)}")
     print(f"   IA_2: {os.path.basename(ARQ_IA_2)}\n")
+    if retomado is not None:
+        print(f"   ↺ Retomando checkpoint: rodada {inicio[0]}, lado {inicio[1] + 1}/2, "
+              f"{retomado['geracoes_feitas']} gerações já feitas\n")
 
     print(f"\n{'='*60}")
     print(f"TREINAMENTO CO-EVOLUTIVO")
@@ -688,37 +1226,236 @@ def treinar_co_evolutivo(caminho_cfg: str, num_rodadas: int, geracoes_por_rodada
     print(f"Rodadas: {num_rodadas}")
     print(f"Gerações por rodada: {geracoes_por_rodada}")
     print(f"Total de gerações: {num_rodadas * geracoes_por_rodada * 2}")
+    if halls:
+        print(f"Hall da fama: {len(halls[ARQ_IA_1])}/{len(halls[ARQ_IA_2])} campeões (máx. {tamanho_hall} por IA)")
     print(f"{'='*60}\n")
 
-    for i in range(1, num_rodadas + 1):
-        print(f"\n{'='*60}")
-        print(f"RODADA {i}/{num_rodadas}")
-        print(f"{'='*60}\n")
+    # MULTIPROCESSAMENTO: pool criado uma vez para todas as rodadas
+    num_cores = num_workers or multiprocessing.cpu_count()
+    avaliador = None
+    if num_cores > 1 and not em_lote:
+        avaliador = AvaliadorPersistente(num_cores, parallel_wrapper, verboso=True)
+    # fitness por (genoma, adversários): vale entre gerações e rodadas
+    # (vai no checkpoint: elites retomadas mantêm a fitness já calculada)
+    cache = retomado["cache"] if retomado is not None else CacheFitness()
+
+    # (arquivo de saída, adversário, descrição) de cada lado da rodada
+    lados = ((ARQ_IA_2, ARQ_IA_1, "IA_2 contra IA_1"),
+             (ARQ_IA_1, ARQ_IA_2, "IA_1 contra IA_2"))
+
+    # o pool é encerrado aqui em qualquer saída: fechar() se tudo correu
+    # bem, terminar() em erro/Ctrl-C (inclusive entre os lados)
+    concluido = False
+    try:
+        for i in range(inicio[0], num_rodadas + 1):
+            print(f"\n{'='*60}")
+            print(f"RODADA {i}/{num_rodadas}")
+            print(f"{'='*60}\n")
+
+            for j, (arquivo_saida, adversario, descricao) in enumerate(lados):
+                if (i, j) < inicio:
+                    continue
+
+                def _contexto(i=i, j=j):
+                    return {"rodada": i, "lado": j, "geracao": geracao,
+                            "num_rodadas": num_rodadas, "geracoes_por_rodada": geracoes_por_rodada,
+                            "campeoes": _ler_campeoes(), "cache": cache}
+
+                print(("\n" if j else "") + f"→ Treinando {descricao}...")
+                try:
+                    _treinar_lado(caminho_cfg, arquivo_saida, adversario, geracoes_por_rodada,
+                                  em_lote=em_lote, avaliador=avaliador, cache=cache, corrida=corrida,
+                                  rodada=i, num_workers=num_cores, arquivo_tempos=ARQ_TEMPOS,
+                                  gravador=gravador, contexto_checkpoint=_contexto,
+                                  intervalo_checkpoint=intervalo_checkpoint,
+                                  retomar=retomado if (i, j) == inicio else None)
+                except KeyboardInterrupt:
+                    print(f"\n⚠ Treinamento interrompido na Rodada {i}")
+                    if gravador is not None:
+                        gravador.esperar()
+                        print(f"   Checkpoint em {os.path.basename(arquivo_checkpoint)}: "
+                              f"treine de novo para retomar")
+                    return
 
-        # Treina IA_2 contra IA_1
-        print(f"→ Treinando IA_2 contra IA_1...")
-        try:
-            _treinar_lado(caminho_cfg, ARQ_IA_2, ARQ_IA_1, geracoes_por_rodada)
-        except KeyboardInterrupt:
-            print(f"\n⚠ Treinamento interrompido na Rodada {i}")
-            return
+                # novo campeão entra no hall da fama da sua IA
+                if halls:
+                    hall = halls[arquivo_saida]
+                    hall.adicionar(rede_para_bytes(carregar_rede_salva(arquivo_saida, compilada=False)),
+                                   f"rodada {i}")
+                    hall.salvar()
+                    _publicar_halls(halls)
+
+                # lado concluído: o checkpoint passa a apontar para o próximo
+                if gravador is not None:
+                    prox_i, prox_j = (i, 1) if j == 0 else (i + 1, 0)
+                    gravador.salvar(montar_estado(_contexto(prox_i, prox_j)))
+
+        concluido = True
+    finally:
+        if avaliador is not None:
+            if concluido:
+                avaliador.fechar()
+            else:
+                avaliador.terminar()
 
-        # Treina IA_1 contra IA_2
-        print(f"\n→ Treinando IA_1 contra IA_2...")
-        try:
-            _treinar_lado(caminho_cfg, ARQ_IA_1, ARQ_IA_2, geracoes_por_rodada)
-        except KeyboardInterrupt:
-            print(f"\n⚠ Treinamento interrompido na Rodada {i}")
-            return
+    if gravador is not None:
+        gravador.remover()
 
     print(f"\n{'='*60}")
     print(f"✓ TREINAMENTO CO-EVOLUTIVO CONCLUÍDO!")
+    print(f"   {resumo_tempos(TEMPOS_GERACOES)}")
+    print(f"   Tempos por geração em {os.path.basename(ARQ_TEMPOS)}")
+    print(f"{'='*60}\n")
+
+
+def treinar_simultaneo(caminho_cfg: str, num_rodadas: int, geracoes_por_rodada: int,
+                       num_workers: Optional[int] = None, tamanho_hall=200, partidas_por_genoma=4):
+    """
+    Co-evolução simultânea (simultaneo.py): as populações da IA_1
+    (esquerda) e da IA_2 (direita) avançam juntas, uma geração de cada por
+    lote de partidas entre elas. São num_rodadas * geracoes_por_rodada
+    gerações; ao fim de cada rodada o melhor genoma da última geração de
+    cada população vai para ARQ_IA_1/ARQ_IA_2 e para o hall da fama
+    (tamanho_hall > 0; uma elite que continua campeã não entra de novo).
+    partidas_por_genoma: partidas de cada genoma por geração.
+    """
+    global geracao
+
+    TEMPOS_GERACOES.clear()
+    geracao = 0
+
+    config = neat.config.Config(neat.DefaultGenome,
+                                neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet,
+                                neat.DefaultStagnation,
+                                caminho_cfg)
+    pop_esq, pop_dir = neat.Population(config), neat.Population(config)
+    melhores = {ARQ_IA_1: ReporterMelhor(), ARQ_IA_2: ReporterMelhor()}
+    for pop, arquivo in ((pop_esq, ARQ_IA_1), (pop_dir, ARQ_IA_2)):
+        pop.add_reporter(neat.StdOutReporter(True))
+        pop.add_reporter(melhores[arquivo])
+    # a avaliação (o lote inteiro) acontece na geração de pop_esq
+    tempos = ReporterTempos("IA_1+IA_2", destino=TEMPOS_GERACOES, arquivo=ARQ_TEMPOS)
+    pop_esq.add_reporter(tempos)
+
+    halls = {}
+    if tamanho_hall > 0:
+        halls = {ARQ_IA_1: HallDaFama(ARQ_HALL_1, tamanho_hall),
+                 ARQ_IA_2: HallDaFama(ARQ_HALL_2, tamanho_hall)}
+
+    total = num_rodadas * geracoes_por_rodada
+    print(f"\n{'='*60}")
+    print("CO-EVOLUÇÃO SIMULTÂNEA (IA_1 à esquerda × IA_2 à direita)")
+    print(f"{'='*60}")
+    print(f"Rodadas: {num_rodadas}")
+    print(f"Gerações por rodada: {geracoes_por_rodada}")
+    print(f"Total de gerações: {total} por população")
+    print(f"Partidas por genoma: {partidas_por_genoma}")
+    print(f"{'='*60}\n")
+
+    num_cores = num_workers or multiprocessing.cpu_count()
+    avaliador = None
+    if num_cores > 1:
+        avaliador = AvaliadorPersistente(num_cores, partida_wrapper, verboso=True)
+        avaliador.publicar(config, preparar=receber_adversarios, extra=_pacote_adversarios(config))
+        # o avaliador acompanha a geração de pop_esq (semente das partidas)
+        pop_esq.add_reporter(avaliador)
+        tempos.avaliador = avaliador
+        print(f"🚀 {avaliador.num_workers} núcleos\n")
+
+        def _jogar_lote(itens, cfg, g):
+            return avaliador.mapear(None, itens, cfg, por_item=2)
+    else:
+        print(f"⚠ {'CPU com 1 núcleo' if num_workers is None else '1 worker'} - modo sequencial\n")
+
+        def _jogar_lote(itens, cfg, g):
+            return [f for item in itens for f in partida_wrapper(item, cfg, g)]
+
+    simultaneo = AvaliadorSimultaneo(pop_esq, pop_dir, _jogar_lote, partidas_por_genoma)
+    salvos = {}  # chave do último campeão de cada IA (elites se repetem)
+    concluido = False
+    try:
+        for i in range(1, num_rodadas + 1):
+            print(f"\n{'='*60}")
+            print(f"RODADA {i}/{num_rodadas}")
+            print(f"{'='*60}")
+            for _ in range(geracoes_por_rodada):
+                geracao += 1
+                pop_esq.run(simultaneo.avaliar_esq, 1)
+                pop_dir.run(simultaneo.avaliar_dir, 1)
+                melhor_1, melhor_2 = melhores[ARQ_IA_1].melhor, melhores[ARQ_IA_2].melhor
+                print(f"   {simultaneo.partidas} partidas | melhor IA_1 {melhor_1.fitness:.2f} "
+                      f"| melhor IA_2 {melhor_2.fitness:.2f}")
+
+            for arquivo, reporter in melhores.items():
+                campeao = reporter.melhor
+                _salvar_campeao(campeao, config, arquivo)
+                if halls and campeao.key != salvos.get(arquivo):
+                    halls[arquivo].adicionar(
+                        rede_para_bytes(rede_do_genoma(campeao, config, compilada=False)),
+                        f"simultânea, rodada {i}")
+                    halls[arquivo].salvar()
+                salvos[arquivo] = campeao.key
+            print(f"\n   ✓ Campeões salvos em {os.path.basename(ARQ_IA_1)} e {os.path.basename(ARQ_IA_2)}")
+        concluido = True
+    except KeyboardInterrupt:
+        print(f"\n⚠ Treinamento interrompido na geração {geracao}")
+        return
+    finally:
+        # fechar() só se tudo correu bem; em erro/Ctrl-C, terminar()
+        if avaliador is not None:
+            if concluido:
+                avaliador.fechar()
+            else:
+                avaliador.terminar()
+
+    print(f"\n{'='*60}")
+    print("✓ CO-EVOLUÇÃO SIMULTÂNEA CONCLUÍDA!")
+    print(f"   {resumo_tempos(TEMPOS_GERACOES)}")
+    print(f"   Tempos por geração em {os.path.basename(ARQ_TEMPOS)}")
     print(f"{'='*60}\n")
 
 
-def _treinar_lado(caminho_config: str, arquivo_saida: str, adversario_pkl: str, geracoes=10):
+def _com_cache(funcao, cache: Optional[CacheFitness], modo: str):
+    """
+    Envolve a função de avaliação com o cache de fitness (se houver).
+    Contexto: modo de avaliação ("genoma" = sequencial/paralelo, que dão a
+    mesma fitness) + contexto_avaliacao(), o mesmo que semeia os trials,
+    + critérios da parada antecipada (trials encurtados não se misturam
+    aos completos): a chave do cache determina a avaliação.
+    """
+    if cache is None:
+        return funcao
+
+    def _contexto():
+        parada = PARADA_TREINO.criterios if PARADA_TREINO is not None else None
+        return (modo, contexto_avaliacao(), parada)
+    return cache.envolver(funcao, _contexto)
+
+
+def _treinar_lado(caminho_config: str, arquivo_saida: str, adversario_pkl: str, geracoes=10,
+                  em_lote=False, avaliador: Optional[AvaliadorPersistente] = None,
+                  cache: Optional[CacheFitness] = None, corrida=False, rodada: Optional[int] = None,
+                  arquivo_tempos: Optional[str] = ARQ_TEMPOS,
+                  gravador: Optional[GravadorCheckpoint] = None,
+                  contexto_checkpoint: Optional[Callable[[], dict]] = None,
+                  intervalo_checkpoint=1, retomar: Optional[dict] = None,
+                  num_workers: Optional[int] = None):
     """
     Treina uma IA com MULTIPROCESSAMENTO.
+    em_lote=True avalia a população inteira vetorizada (func_avaliacao_lote)
+    num único processo, em vez de um genoma por worker.
+    avaliador: pool persistente a reaproveitar (senão cria um só para esta chamada).
+    cache: fitness já calculadas (elites/clones não são reavaliados).
+    corrida=True: successive halving nos 4 trials (AvaliadorCorrida), só
+    os melhores de cada geração jogam todos os trials. Sem cache: a
+    fitness de quem foi eliminado depende do resto da população.
+    rodada/arquivo_tempos: tempos por geração vão para TEMPOS_GERACOES e
+    são acrescentados a arquivo_tempos (.jsonl/.csv; None = só memória).
+    gravador/contexto_checkpoint: checkpoint da população a cada
+    intervalo_checkpoint gerações (contexto_checkpoint() dá a posição na
+    co-evolução). retomar: checkpoint com a população deste lado.
+    num_workers: processos do pool próprio (None = nº de CPUs).
     """
     global geracao
     
@@ -728,38 +1465,206 @@ def _treinar_lado(caminho_config: str, arquivo_saida: str, adversario_pkl: str,
                                 neat.DefaultStagnation,
                                 caminho_config)
 
-    pop = neat.Population(config)
+    feitas = 0
+    if retomar is not None and retomar["populacao"] is not None:
+        pop = restaurar_populacao(config, retomar["populacao"])
+        feitas = retomar["geracoes_feitas"]
+    else:
+        pop = neat.Population(config)
     pop.add_reporter(neat.StdOutReporter(True))
     pop.add_reporter(neat.StatisticsReporter())
+    pop.add_reporter(ReporterGeracao())
+    if gravador is not None:
+        pop.add_reporter(ReporterCheckpoint(gravador, pop, contexto_checkpoint,
+                                            intervalo_checkpoint, geracoes_feitas=feitas))
+    tempos = ReporterTempos(os.path.basename(arquivo_saida), rodada,
+                            destino=TEMPOS_GERACOES, arquivo=arquivo_tempos)
+    pop.add_reporter(tempos)
 
     nome_adversario = os.path.basename(adversario_pkl) if os.path.exists(adversario_pkl) else 'Heurística'
     print(f"   Arquivo de saída: {os.path.basename(arquivo_saida)}")
     print(f"   Adversário: {nome_adversario}")
     print(f"   Gerações: {geracoes}")
+    if feitas:
+        print(f"   ↺ Retomando na geração {pop.generation} ({feitas} já feitas)")
+    geracoes = max(0, geracoes - feitas)
 
     # MULTIPROCESSAMENTO
-    num_cores = multiprocessing.cpu_count()
+    num_cores = num_workers or multiprocessing.cpu_count()
     
-    if num_cores > 1:
-        evaluator = neat.ParallelEvaluator(num_cores, parallel_wrapper)
-        print(f"   🚀 Treinando com {num_cores} núcleos\n")
-        campeao = pop.run(evaluator.evaluate, geracoes)
+    if em_lote:
+        print("   🧮 Avaliação em lote (NumPy, 1 processo)\n")
+        # sem cache: o lote sorteia com um rng da geração para a população
+        # inteira, então a fitness de um genoma depende do lote todo
+        campeao = pop.run(func_avaliacao_lote, geracoes)
+    elif avaliador is not None or num_cores > 1:
+        proprio = avaliador is None
+        if proprio:
+            avaliador = AvaliadorPersistente(num_cores, parallel_wrapper, verboso=True)
+        print(f"   🚀 Treinando com {avaliador.num_workers} núcleos\n")
+        # config + adversários vão uma vez por worker, não a cada genoma
+        avaliador.publicar(config, preparar=receber_adversarios, extra=_pacote_adversarios(config))
+        # o avaliador também é reporter: repassa a geração (semente) aos workers
+        pop.add_reporter(avaliador)
+        tempos.avaliador = avaliador
+        try:
+            if corrida:
+                av_corrida = AvaliadorCorrida(
+                    lambda gs, cfg, idx: avaliar_no_pool(avaliador, gs, cfg, indices_trials=idx),
+                    verboso=True)
+                funcao = av_corrida.evaluate
+            else:
+                def _avaliar(genomas, cfg):
+                    for (_, g), f in zip(genomas, avaliar_no_pool(avaliador, genomas, cfg)):
+                        g.fitness = f
+                funcao = _com_cache(_avaliar, cache, "genoma")
+            campeao = pop.run(funcao, geracoes)
+        except BaseException:
+            if proprio:
+                avaliador.terminar()
+            raise
+        finally:
+            pop.remove_reporter(avaliador)
+        if proprio:
+            avaliador.fechar()
     else:
-        print(f"   ⚠ CPU com 1 núcleo - modo sequencial\n")
-        campeao = pop.run(func_avaliacao, geracoes)
+        print(f"   ⚠ {'CPU com 1 núcleo' if num_workers is None else '1 worker'} - modo sequencial\n")
+        if corrida:
+            av_corrida = AvaliadorCorrida(avaliar_trials_sequencial, verboso=True)
+            campeao = pop.run(av_corrida.evaluate, geracoes)
+        else:
+            campeao = pop.run(_com_cache(func_avaliacao, cache, "genoma"), geracoes)
 
-    with open(arquivo_saida, "wb") as f:
-        pickle.dump(campeao, f)
+    if cache is not None and not (em_lote or corrida):
+        print(f"   {cache.resumo()}")
+    if PARADA_TREINO is not None and not em_lote:
+        print(f"   {PARADA_TREINO.resumo()}")
 
+    _salvar_campeao(campeao, config, arquivo_saida)
     print(f"\n   ✓ Campeão salvo em {os.path.basename(arquivo_saida)}\n")
     
     return campeao
 
 
+def _salvar_campeao(campeao, config, arquivo_saida: str):
+    # intervalo de decisão e passo do treino vão junto (metadados do
+    # genoma): nos modos de jogo a rede decide no mesmo tempo de jogo
+    campeao.intervalo_decisao = INTERVALO_DECISAO
+    campeao.passo_treino = PASSO_TREINO
+    with open(arquivo_saida, "wb") as f:
+        pickle.dump(campeao, f)
+    salvar_rede(rede_do_genoma(campeao, config, compilada=False), arquivo_rede(arquivo_saida))
+    # novo campeão: a rede antiga deste arquivo não vale mais como adversária
+    invalidar_cache_adversarios(arquivo_saida)
+
+
+# ==========================
+# CLI (TREINO SEM JANELA)
+# ==========================
+def cli_treinar(rodadas: int, geracoes: int, workers: Optional[int] = None,
+                saida: Optional[str] = None, recomecar=False, tamanho_hall=200, simultanea=False,
+                intervalo_decisao=1, passo: Optional[float] = None,
+                parada_pontos: Optional[int] = None, corrida=False, em_lote=False):
+    """
+    Co-evolução sem pygame.display: nenhuma janela é aberta e o progresso
+    vai só para o stdout. saida: diretório dos genomas, checkpoint e
+    tempos (IAs ausentes lá começam como cópia das atuais).
+    simultanea=True: as duas populações evoluem juntas (treinar_simultaneo).
+    intervalo_decisao: frames entre consultas à rede (INTERVALO_DECISAO).
+    passo: segundos por passo da simulação (PASSO_TREINO; None = 1/FPS).
+    parada_pontos: encerra cedo trials com K gols sofridos seguidos sem
+    rebatida (PARADA_TREINO; None = trials completos).
+    corrida/em_lote: avaliação por corrida (AvaliadorCorrida) ou em lote
+    (func_avaliacao_lote) em cada lado da co-evolução.
+    """
+    global ARQ_IA_1, ARQ_IA_2, ARQ_TEMPOS, ARQ_CHECKPOINT, ARQ_HALL_1, ARQ_HALL_2, INTERVALO_DECISAO
+    global PASSO_TREINO, PARADA_TREINO
+    INTERVALO_DECISAO = max(1, intervalo_decisao)
+    if parada_pontos is not None:
+        PARADA_TREINO = ParadaAntecipada(parada_pontos)
+    if passo is not None:
+        PASSO_TREINO = passo
+    base = os.path.dirname(os.path.abspath(__file__))
+    if saida is not None:
+        os.makedirs(saida, exist_ok=True)
+        for atual in (ARQ_IA_1, ARQ_IA_2):
+            destino = os.path.join(saida, os.path.basename(atual))
+            if not os.path.exists(destino) and os.path.exists(atual):
+                shutil.copy(atual, destino)
+                print(f"📄 {os.path.basename(atual)} copiado para {saida}")
+        ARQ_IA_1 = os.path.join(saida, os.path.basename(ARQ_IA_1))
+        ARQ_IA_2 = os.path.join(saida, os.path.basename(ARQ_IA_2))
+        ARQ_TEMPOS = os.path.join(saida, os.path.basename(ARQ_TEMPOS))
+        ARQ_CHECKPOINT = os.path.join(saida, os.path.basename(ARQ_CHECKPOINT))
+        ARQ_HALL_1 = os.path.join(saida, os.path.basename(ARQ_HALL_1))
+        ARQ_HALL_2 = os.path.join(saida, os.path.basename(ARQ_HALL_2))
+
+    if simultanea:
+        treinar_simultaneo(os.path.join(base, "config-neat.txt"), rodadas, geracoes,
+                           num_workers=workers, tamanho_hall=tamanho_hall)
+        return
+    treinar_co_evolutivo(os.path.join(base, "config-neat.txt"), rodadas, geracoes,
+                         arquivo_checkpoint=ARQ_CHECKPOINT, retomar=not recomecar,
+                         num_workers=workers, tamanho_hall=tamanho_hall,
+                         corrida=corrida, em_lote=em_lote)
+
+
+def _argumentos(argv=None):
+    import argparse
+    from fractions import Fraction
+    parser = argparse.ArgumentParser(description="Pong + NEAT (sem argumentos: abre o jogo)")
+    sub = parser.add_subparsers(dest="comando")
+    treino = sub.add_parser("train", aliases=["treinar"],
+                            help="treino co-evolutivo sem janela (progresso no terminal)")
+    treino.add_argument("--rounds", type=int, default=2, help="rodadas de co-evolução (padrão 2)")
+    treino.add_argument("--gens", type=int, default=10, help="gerações por lado em cada rodada (padrão 10)")
+    treino.add_argument("--workers", type=int, default=None,
+                        help="processos de avaliação (padrão: nº de CPUs; 1 = sequencial)")
+    treino.add_argument("--out", default=None,
+                        help="diretório dos genomas/checkpoint/tempos (padrão: o do projeto)")
+    treino.add_argument("--restart", action="store_true",
+                        help="ignora um checkpoint existente e começa a co-evolução do início")
+    treino.add_argument("--hall", type=int, default=200,
+                        help="campeões antigos por IA sorteados como adversários (0 = desliga)")
+    treino.add_argument("--simultaneous", action="store_true",
+                        help="IA_1 e IA_2 evoluem juntas, avaliadas nas mesmas partidas "
+                             "(--gens gerações por rodada para as duas; sem checkpoint)")
+    treino.add_argument("--frame-skip", type=int, default=1,
+                        help="as redes decidem a cada K frames e repetem a ação entre as decisões "
+                             "(gravado nos campeões; padrão 1)")
+    treino.add_argument("--dt", type=lambda v: float(Fraction(v)), default=None,
+                        help="segundos por passo da simulação, ex.: 1/30 (padrão 1/60; "
+                             "passos maiores usam colisão contínua)")
+    treino.add_argument("--early-stop", type=int, default=None, metavar="K",
+                        help="encerra cedo o trial após K gols sofridos seguidos sem rebatida "
+                             "(resto extrapolado; padrão: trials completos)")
+    treino.add_argument("--racing", action="store_true",
+                        help="avaliação por corrida: todos jogam 1 trial, só a metade melhor "
+                             "joga os outros 3")
+    treino.add_argument("--batch", action="store_true",
+                        help="avalia a população inteira em lote (NumPy, 1 processo, sem hall "
+                             "da fama nem cache)")
+    args = parser.parse_args(argv)
+    if args.comando in ("train", "treinar"):
+        if args.batch and (args.racing or args.early_stop is not None
+                           or args.dt not in (None, 1.0 / FPS)):
+            parser.error("--batch não combina com --racing, --early-stop nem outro --dt")
+        if args.simultaneous and (args.racing or args.batch):
+            parser.error("--simultaneous não usa --racing nem --batch")
+    return args
+
+
 if __name__ == "__main__":
     # CRITICAL: multiprocessing no Windows requer freeze_support
     multiprocessing.freeze_support()
-    
+
+    args = _argumentos()
+    if args.comando in ("train", "treinar"):
+        cli_treinar(args.rounds, args.gens, args.workers, args.out, args.restart, args.hall,
+                    args.simultaneous, args.frame_skip, args.dt, args.early_stop,
+                    args.racing, args.batch)
+        sys.exit(0)
+
     # Inicializa pygame APENAS no processo principal
     pygame.init()
     pygame.display.set_caption("Pong + NEAT")
@@ -0,0 +1,306 @@
+"""
+Redes NEAT especializadas para inferência rápida.
+
+RedeCompilada gera, a partir das conexões habilitadas do genoma, uma
+função Python com pesos/bias como constantes e variáveis locais no lugar
+do dicionário de valores de FeedForwardNetwork. As saídas são bit a bit
+iguais às de neat.nn.FeedForwardNetwork.activate.
+
+salvar_rede/carregar_rede guardam a rede pronta (nós em ordem
+topológica, bias/response/pesos em arrays) num binário plano .rede:
+carregar é uma leitura só, sem desserializar o DefaultGenome, sem
+config e sem refazer a topologia.
+
+O intervalo de decisão (passos entre consultas à rede, ver
+pong_neat.repetir_acao) e o passo da simulação no treino (--dt) são
+metadados do genoma salvo (genoma.intervalo_decisao, genoma.passo_treino)
+que acompanham a rede, inclusive no .rede: quem joga com outro passo
+converte o intervalo com intervalo_em_passos.
+    python redes.py IA_treinada_1.pkl IA_treinada_2.pkl   # gera os .rede
+"""
+import os
+import sys
+import math
+import pickle
+import struct
+from array import array
+
+import neat
+from neat.activations import ActivationFunctionSet, tanh_activation
+from neat.aggregations import AggregationFunctionSet, sum_aggregation
+
+from simulacao import FPS
+
+
+def intervalo_decisao(objeto) -> int:
+    """Intervalo de decisão de um genoma ou rede, em passos do treino (1 = todo passo)."""
+    return getattr(objeto, "intervalo_decisao", 1)
+
+
+def passo_treino(objeto) -> float:
+    """Segundos por passo da simulação em que o genoma/rede foi treinado."""
+    return getattr(objeto, "passo_treino", 1.0 / FPS)
+
+
+def intervalo_em_passos(objeto, dt: float = 1.0 / FPS) -> int:
+    """
+    Passos de dt entre consultas à rede, mantendo o tempo de jogo entre
+    decisões do treino (ex.: treinada a 1/30 com intervalo 2 -> 4 frames
+    de 1/60).
+    """
+    return max(1, round(intervalo_decisao(objeto) * passo_treino(objeto) / dt))
+
+
+def rede_do_genoma(genoma, config, compilada=True):
+    """Rede do genoma (RedeCompilada ou FeedForwardNetwork) com intervalo de decisão e passo."""
+    rede = neat.nn.FeedForwardNetwork.create(genoma, config)
+    rede.intervalo_decisao = intervalo_decisao(genoma)
+    rede.passo_treino = passo_treino(genoma)
+    return RedeCompilada(rede) if compilada else rede
+
+
+def _var(no: int) -> str:
+    # nós de entrada têm chave negativa no neat-python
+    return f"i{-no}" if no < 0 else f"n{no}"
+
+
+def _gerar_fonte(rede: neat.nn.FeedForwardNetwork):
+    """
+    Retorna (fonte, namespace) da função activate(inputs) equivalente à rede.
+    tanh/sum ficam inline; outras funções são chamadas pelo namespace.
+    """
+    namespace = {"tanh": math.tanh, "sum": sum}
+    linhas = [
+        "def activate(inputs):",
+        "    " + ", ".join(_var(k) for k in rede.input_nodes) + ", = inputs",
+    ]
+    avaliados = set(rede.input_nodes)
+    for node, act, agg, bias, resp, links in rede.node_evals:
+        # mesma ordem de multiplicação/soma de FeedForwardNetwork.activate
+        termos = "".join(f"{_var(i)} * {w!r}, " for i, w in links)
+        if agg is sum_aggregation:
+            s = f"sum(({termos}))"
+        else:
+            namespace[f"agg{node}"] = agg
+            s = f"agg{node}([{termos}])"
+        z = f"{bias!r} + {resp!r} * {s}"
+        if act is tanh_activation:
+            expr = f"tanh(max(-60.0, min(60.0, 2.5 * ({z}))))"
+        else:
+            namespace[f"act{node}"] = act
+            expr = f"act{node}({z})"
+        linhas.append(f"    {_var(node)} = {expr}")
+        avaliados.add(node)
+
+    # saídas nunca avaliadas ficam em 0.0, como no dicionário original
+    saidas = [_var(k) if k in avaliados else "0.0" for k in rede.output_nodes]
+    corpo = linhas[1:]
+    linhas.append(f"    return [{', '.join(saidas)}]")
+
+    # indice_max(inputs): mesmo índice de outputs.index(max(outputs)),
+    # sem montar a lista de saídas
+    linhas.append("def indice_max(inputs):")
+    linhas.extend(corpo)
+    for i, si in enumerate(saidas[:-1]):
+        cond = [f"{si} > {sj}" for sj in saidas[:i]] + [f"{si} >= {sj}" for sj in saidas[i + 1:]]
+        linhas.append(f"    if {' and '.join(cond)}: return {i}")
+    linhas.append(f"    return {len(saidas) - 1}")
+    return "\n".join(linhas) + "\n", namespace
+
+
+class RedeCompilada:
+    """
+    Substituto de neat.nn.FeedForwardNetwork com activate() gerado.
+    indice_max(inputs) devolve direto o argmax das saídas.
+    Mantém input_nodes/output_nodes/node_evals para uso em lote.RedesLote.
+    """
+
+    def __init__(self, rede: neat.nn.FeedForwardNetwork):
+        self.input_nodes = rede.input_nodes
+        self.output_nodes = rede.output_nodes
+        self.node_evals = rede.node_evals
+        self.intervalo_decisao = intervalo_decisao(rede)
+        self.passo_treino = passo_treino(rede)
+        self._compilar()
+
+    def _compilar(self):
+        self.fonte, namespace = _gerar_fonte(self)
+        exec(compile(self.fonte, "<rede_compilada>", "exec"), namespace)
+        self.activate = namespace["activate"]
+        self.indice_max = namespace["indice_max"]
+
+    @staticmethod
+    def create(genome, config):
+        return rede_do_genoma(genome, config)
+
+    # a função gerada não é picklável: recompila ao chegar no worker
+    def __getstate__(self):
+        return {"input_nodes": self.input_nodes,
+                "output_nodes": self.output_nodes,
+                "node_evals": self.node_evals,
+                "intervalo_decisao": self.intervalo_decisao,
+                "passo_treino": self.passo_treino}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._compilar()
+
+
+# ==========================
+# FORMATO BINÁRIO (.rede)
+# ==========================
+# cabeçalho: MAGICO, versão, contagens (entradas, saídas, nós, links,
+# bytes dos nomes), o intervalo de decisão e o passo do treino em
+# segundos; depois, em little-endian:
+#   int64  entradas, saídas, nós (ordem topológica), início dos links
+#          de cada nó (nós + 1), origem de cada link
+#   float64 bias, response, peso de cada link
+#   utf-8  nomes de ativação e agregação de cada nó, separados por "\n"
+MAGICO = b"PNRD"
+_CABECALHO = struct.Struct("<4sHIIIIIHd")
+_ATIVACOES = ActivationFunctionSet().functions
+_AGREGACOES = AggregationFunctionSet().functions
+_NOME_ATIVACAO = {f: nome for nome, f in _ATIVACOES.items()}
+_NOME_AGREGACAO = {f: nome for nome, f in _AGREGACOES.items()}
+
+
+def _le(valores: array) -> bytes:
+    if sys.byteorder != "little":
+        valores.byteswap()
+    return valores.tobytes()
+
+
+def rede_para_bytes(rede) -> bytes:
+    """
+    Serializa rede (FeedForwardNetwork ou RedeCompilada) no formato .rede.
+    Só funções de ativação/agregação padrão do neat.
+    """
+    nos, bias, resp, nomes, inicio, origem, peso = [], [], [], [], [0], [], []
+    for node, act, agg, b, r, links in rede.node_evals:
+        if act not in _NOME_ATIVACAO or agg not in _NOME_AGREGACAO:
+            raise ValueError(f"nó {node}: função de ativação/agregação não padrão")
+        nos.append(node)
+        bias.append(b)
+        resp.append(r)
+        nomes.append(_NOME_ATIVACAO[act])
+        nomes.append(_NOME_AGREGACAO[agg])
+        for i, w in links:
+            origem.append(i)
+            peso.append(w)
+        inicio.append(len(origem))
+    texto = "\n".join(nomes).encode()
+    cab = _CABECALHO.pack(MAGICO, 3, len(rede.input_nodes), len(rede.output_nodes),
+                          len(nos), len(origem), len(texto), intervalo_decisao(rede),
+                          passo_treino(rede))
+    inteiros = array("q", list(rede.input_nodes) + list(rede.output_nodes) + nos + inicio + origem)
+    reais = array("d", bias + resp + peso)
+    return cab + _le(inteiros) + _le(reais) + texto
+
+
+def rede_de_bytes(dados: bytes, compilada=True):
+    """
+    Lê uma rede de rede_para_bytes. compilada=False devolve uma
+    neat.nn.FeedForwardNetwork.
+    """
+    (magico, versao, n_ent, n_sai, n_nos, n_links, n_texto,
+     intervalo, passo) = _CABECALHO.unpack_from(dados)
+    if magico != MAGICO or versao != 3:
+        raise ValueError("formato de rede desconhecido")
+    pos = _CABECALHO.size
+    n_int = n_ent + n_sai + n_nos + (n_nos + 1) + n_links
+    inteiros = array("q", dados[pos:pos + 8 * n_int])
+    pos += 8 * n_int
+    reais = array("d", dados[pos:pos + 8 * (2 * n_nos + n_links)])
+    pos += 8 * (2 * n_nos + n_links)
+    if sys.byteorder != "little":
+        inteiros.byteswap()
+        reais.byteswap()
+    nomes = dados[pos:pos + n_texto].decode().split("\n") if n_texto else []
+
+    inteiros = inteiros.tolist()
+    reais = reais.tolist()
+    entradas = inteiros[:n_ent]
+    saidas = inteiros[n_ent:n_ent + n_sai]
+    k = n_ent + n_sai
+    nos = inteiros[k:k + n_nos]
+    inicio = inteiros[k + n_nos:k + 2 * n_nos + 1]
+    origem = inteiros[k + 2 * n_nos + 1:]
+    bias, resp, peso = reais[:n_nos], reais[n_nos:2 * n_nos], reais[2 * n_nos:]
+
+    node_evals = []
+    for j, node in enumerate(nos):
+        links = list(zip(origem[inicio[j]:inicio[j + 1]], peso[inicio[j]:inicio[j + 1]]))
+        node_evals.append((node, _ATIVACOES[nomes[2 * j]], _AGREGACOES[nomes[2 * j + 1]],
+                           bias[j], resp[j], links))
+    rede = neat.nn.FeedForwardNetwork(entradas, saidas, node_evals)
+    rede.intervalo_decisao = intervalo
+    rede.passo_treino = passo
+    return RedeCompilada(rede) if compilada else rede
+
+
+def salvar_rede(rede, caminho: str):
+    # escrita atômica: quem lê nunca vê um arquivo pela metade
+    tmp = caminho + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(rede_para_bytes(rede))
+    os.replace(tmp, caminho)
+
+
+def carregar_rede(caminho: str, compilada=True):
+    """Rede de um arquivo .rede (uma leitura só)."""
+    with open(caminho, "rb") as f:
+        return rede_de_bytes(f.read(), compilada)
+
+
+def arquivo_rede(arquivo_pkl: str) -> str:
+    """Caminho do .rede correspondente a um genoma .pkl."""
+    return os.path.splitext(arquivo_pkl)[0] + ".rede"
+
+
+def converter_pkl(arquivo_pkl: str, config, arquivo_saida: str = None) -> str:
+    """Gera o .rede do genoma salvo em arquivo_pkl; devolve o caminho."""
+    with open(arquivo_pkl, "rb") as f:
+        genoma = pickle.load(f)
+    arquivo_saida = arquivo_saida or arquivo_rede(arquivo_pkl)
+    salvar_rede(rede_do_genoma(genoma, config, compilada=False), arquivo_saida)
+    return arquivo_saida
+
+
+def rede_atualizada(arquivo_pkl: str) -> bool:
+    """O .rede de arquivo_pkl existe e não é mais antigo que o .pkl?"""
+    rede = arquivo_rede(arquivo_pkl)
+    if not os.path.exists(rede):
+        return False
+    return not os.path.exists(arquivo_pkl) or os.stat(rede).st_mtime_ns >= os.stat(arquivo_pkl).st_mtime_ns
+
+
+def carregar_rede_salva(arquivo_pkl: str, config=None, compilada=True):
+    """
+    Rede do genoma em arquivo_pkl, lida do .rede ao lado quando atualizado
+    (senão, do próprio .pkl, que exige a config). O .pkl continua sendo a
+    referência: um .rede mais antigo que ele é ignorado.
+    """
+    if rede_atualizada(arquivo_pkl):
+        return carregar_rede(arquivo_rede(arquivo_pkl), compilada)
+    if config is None:
+        raise ValueError(f"{os.path.basename(arquivo_pkl)} sem .rede atualizado: config necessária")
+    with open(arquivo_pkl, "rb") as f:
+        genoma = pickle.load(f)
+    return rede_do_genoma(genoma, config, compilada)
+
+
+if __name__ == "__main__":
+    # converte os .pkl passados (ou os genomas do projeto) para .rede
+    base = os.path.dirname(os.path.abspath(__file__))
+    config = neat.config.Config(neat.DefaultGenome,
+                                neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet,
+                                neat.DefaultStagnation,
+                                os.path.join(base, "config-neat.txt"))
+    arquivos = sys.argv[1:] or [os.path.join(base, n) for n in
+                                ("melhor_genoma.pkl", "IA_treinada_1.pkl", "IA_treinada_2.pkl")]
+    for arq in arquivos:
+        if os.path.exists(arq):
+            print(f"✓ {arq} → {converter_pkl(arq, config)}")
+        else:
+            print(f"⚠ {arq} não encontrado")
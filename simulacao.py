@@ -0,0 +1,315 @@
+"""
+Núcleo de física do Pong SEM pygame (headless).
+
+Usado pelos workers de treino: só floats/ints e colisão AABB simples,
+sem alocar pygame.Rect a cada passo. Reproduz exatamente a física das
+classes de pong_neat (que apenas herdam daqui e adicionam o desenho).
+
+Toda aleatoriedade (direção inicial e saques) vem do `rng` recebido
+(random.Random); sem ele, usa o módulo random global.
+
+Com varredura=True (colisão contínua), a bola percorre o passo como um
+segmento: paredes e a face da raquete são atingidas no instante exato e
+o resto do passo segue com a nova direção. Assim passos maiores que
+1/FPS (ex.: 1/30) não deixam a bola atravessar a raquete (a 1000 px/s
+ela anda 33 px por passo; raquete + bola medem 32).
+"""
+import math
+import random
+from typing import Callable
+
+# ==========================
+# DIMENSÕES DO CAMPO
+# ==========================
+LARGURA = 900
+ALTURA = 600
+FPS = 60
+
+
+# ==========================
+# ENTIDADES
+# ==========================
+class RaqueteSim:
+    # posição/tamanho inteiros, como no pygame.Rect original
+    __slots__ = ("x", "y", "largura", "altura", "vel")
+
+    def __init__(self, x, y, largura=14, altura=100, velocidade=420):
+        self.x = int(x)
+        self.y = int(y)
+        self.largura = int(largura)
+        self.altura = int(altura)
+        self.vel = velocidade
+
+    def mover(self, direcao, dt):
+        # direcao: -1 cima / +1 baixo / 0 parado
+        self.y += int(self.vel * direcao * dt)
+        if self.y < 0:
+            self.y = 0
+        if self.y + self.altura > ALTURA:
+            self.y = ALTURA - self.altura
+
+    @property
+    def left(self): return self.x
+    @property
+    def right(self): return self.x + self.largura
+    @property
+    def top(self): return self.y
+    @property
+    def bottom(self): return self.y + self.altura
+    @property
+    def centery(self): return self.y + self.altura // 2
+
+
+class BolaSim:
+    __slots__ = ("x", "y", "raio", "vel", "dirx", "diry",
+                 "incremento_vel", "vel_max", "angulo_max", "rng")
+
+    def __init__(self, x, y, raio=9, vel_inicial=420, rng=None):
+        self.rng = rng if rng is not None else random
+        self.x = float(x)
+        self.y = float(y)
+        self.raio = raio
+        self.vel = vel_inicial
+        # Direção inicial ligeiramente inclinada
+        ang = self.rng.uniform(-0.35, 0.35)
+        self.dirx = 1.0 * math.cos(ang)
+        self.diry = math.sin(ang)
+
+        self.incremento_vel = 24
+        self.vel_max = 1000
+        self.angulo_max = math.radians(60)
+
+    def _normalize(self):
+        m = math.hypot(self.dirx, self.diry)
+        if m == 0:
+            self.dirx, self.diry = 1.0, 0.0
+        else:
+            self.dirx /= m
+            self.diry /= m
+
+    def resetar(self, lado=1):
+        self.x = LARGURA / 2
+        self.y = ALTURA / 2
+        self.vel = 420
+        self.dirx = 1.0 * lado
+        self.diry = self.rng.choice([-0.25, 0.25])
+        self._normalize()
+
+    def mover(self, dt):
+        self.x += self.dirx * self.vel * dt
+        self.y += self.diry * self.vel * dt
+
+        # colisão vertical
+        if self.top <= 0:
+            self.y = self.raio
+            self.diry *= -1
+        elif self.bottom >= ALTURA:
+            self.y = ALTURA - self.raio
+            self.diry *= -1
+
+    @property
+    def left(self): return self.x - self.raio
+    @property
+    def right(self): return self.x + self.raio
+    @property
+    def top(self): return self.y - self.raio
+    @property
+    def bottom(self): return self.y + self.raio
+
+    def colide_com_raquete(self, rq: RaqueteSim, eh_esquerda: bool):
+        # AABB da bola truncada para int (mesmo critério do pygame.Rect)
+        bx = int(self.x - self.raio)
+        by = int(self.y - self.raio)
+        lado = self.raio * 2
+        if (bx < rq.x + rq.largura and rq.x < bx + lado and
+                by < rq.y + rq.altura and rq.y < by + lado):
+            self._rebater(rq, eh_esquerda)
+            return True
+        return False
+
+    def _rebater(self, rq: RaqueteSim, eh_esquerda: bool):
+        # ponto de contato relativo
+        centro = rq.y + rq.altura // 2
+        relativo = (self.y - centro) / (rq.altura / 2)
+        relativo = max(-1.0, min(1.0, relativo))
+        ang = relativo * self.angulo_max
+        self.dirx = math.cos(ang)
+        self.diry = math.sin(ang)
+        self.dirx = abs(self.dirx)
+        if not eh_esquerda:
+            self.dirx *= -1
+        self._normalize()
+
+        # empurra para fora
+        if eh_esquerda:
+            self.x = rq.x + rq.largura + self.raio + 1
+        else:
+            self.x = rq.x - self.raio - 1
+
+        self.vel = min(self.vel + self.incremento_vel, self.vel_max)
+
+    def mover_varrido(self, dt, raq_esq: RaqueteSim, raq_dir: RaqueteSim):
+        """
+        mover + colide_com_raquete com colisão contínua: percorre o passo
+        de evento em evento (parede ou face da raquete que a bola encara,
+        no instante exato do contato) e devolve (col_esq, col_dir).
+        Contatos que a varredura não vê (a raquete que se moveu para
+        cima da bola, quinas) caem no teste de sobreposição normal.
+        """
+        col_esq = col_dir = False
+        restante = dt
+        for _ in range(8):
+            vx = self.dirx * self.vel
+            vy = self.diry * self.vel
+            t = restante
+            evento = None
+            # paredes: centro a um raio da borda
+            if vy < 0:
+                tp = (self.raio - self.y) / vy
+            elif vy > 0:
+                tp = (ALTURA - self.raio - self.y) / vy
+            else:
+                tp = t
+            if tp < t:
+                t, evento = max(tp, 0.0), "parede"
+            # face da raquete para onde a bola vai (retângulo expandido pelo raio)
+            rq = raq_esq if vx < 0 else raq_dir if vx > 0 else None
+            if rq is not None:
+                face = rq.x + rq.largura + self.raio if vx < 0 else rq.x - self.raio
+                tr = (face - self.x) / vx
+                if 0.0 <= tr < t:
+                    y = self.y + vy * tr
+                    if rq.y - self.raio < y < rq.y + rq.altura + self.raio:
+                        t, evento = tr, rq
+
+            self.x += vx * t
+            self.y += vy * t
+            restante -= t
+            if evento is None:
+                break
+            if evento == "parede":
+                self.diry *= -1
+            else:
+                esquerda = evento is raq_esq
+                self._rebater(evento, esquerda)
+                if esquerda:
+                    col_esq = True
+                else:
+                    col_dir = True
+            if restante <= 0.0:
+                break
+
+        # o que sobrar fora do campo (arredondamento) volta para dentro
+        if self.top < 0:
+            self.y = self.raio
+        elif self.bottom > ALTURA:
+            self.y = ALTURA - self.raio
+        if not col_esq:
+            col_esq = self.colide_com_raquete(raq_esq, True)
+        if not col_dir:
+            col_dir = self.colide_com_raquete(raq_dir, False)
+        return col_esq, col_dir
+
+
+# ==========================
+# OBSERVAÇÃO DOS CONTROLADORES
+# ==========================
+class Observacao:
+    """
+    Estado visto pelos controladores, preenchido no lugar a cada passo
+    (um objeto por jogo, sem criar um dict novo por frame).
+
+    Controladores recebem este objeto e leem os atributos. Para código
+    antigo que indexa como dict (estado["ball_x"]), __getitem__ continua
+    funcionando; quem precisar de um dict de verdade usa como_dict() ou
+    envolve o controlador com controlador_de_dict.
+    """
+    __slots__ = ("ball_x", "ball_y", "ball_vx", "ball_vy", "left_y", "right_y")
+
+    def __init__(self):
+        self.ball_x = 0.0
+        self.ball_y = 0.0
+        self.ball_vx = 0.0
+        self.ball_vy = 0.0
+        self.left_y = 0
+        self.right_y = 0
+
+    def __getitem__(self, chave):
+        return getattr(self, chave)
+
+    def como_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+def controlador_de_dict(ctrl: Callable[[dict], int]) -> Callable[[Observacao], int]:
+    """Adapta um controlador antigo que espera um dict de estado."""
+    def _ctrl(obs):
+        return ctrl(obs.como_dict())
+    return _ctrl
+
+
+# ==========================
+# JOGO BASE (HEADLESS)
+# ==========================
+class JogoPongSim:
+    __slots__ = ("raq_esq", "raq_dir", "bola", "placar_esq", "placar_dir", "pausado", "obs",
+                 "varredura")
+
+    # classes das entidades (as versões pygame sobrescrevem)
+    _Raquete = RaqueteSim
+    _Bola = BolaSim
+
+    def __init__(self, rng=None, varredura=False):
+        # rng: random.Random usado pela bola (None = módulo random global)
+        # varredura: colisão contínua (BolaSim.mover_varrido), para dt > 1/FPS
+        self.varredura = varredura
+        margem = 36
+        self.raq_esq = self._Raquete(margem, ALTURA//2 - 50)
+        self.raq_dir = self._Raquete(LARGURA - margem - 14, ALTURA//2 - 50)
+        self.bola = self._Bola(LARGURA/2, ALTURA/2, rng=rng)
+        self.placar_esq = 0
+        self.placar_dir = 0
+        self.pausado = False
+        self.obs = Observacao()
+
+    def reiniciar_round(self, quem_marco: str):
+        # quem_marco: "esq" ou "dir"
+        lado = -1 if quem_marco == "esq" else 1
+        self.bola.resetar(lado)
+
+    def step(self, dt, ctrl_esq: Callable[[Observacao], int], ctrl_dir: Callable[[Observacao], int]):
+        # controladores retornam -1/0/+1 com base na observação
+        bola = self.bola
+        obs = self.obs
+        obs.ball_x = bola.x
+        obs.ball_y = bola.y
+        obs.ball_vx = bola.dirx * bola.vel
+        obs.ball_vy = bola.diry * bola.vel
+        obs.left_y = self.raq_esq.y + self.raq_esq.altura // 2
+        obs.right_y = self.raq_dir.y + self.raq_dir.altura // 2
+        self.raq_esq.mover(ctrl_esq(obs), dt)
+        self.raq_dir.mover(ctrl_dir(obs), dt)
+
+        if self.varredura:
+            col_esq, col_dir = bola.mover_varrido(dt, self.raq_esq, self.raq_dir)
+        else:
+            bola.mover(dt)
+            col_esq = bola.colide_com_raquete(self.raq_esq, True)
+            col_dir = bola.colide_com_raquete(self.raq_dir, False)
+
+        ponto = None
+        if bola.right < 0:
+            self.placar_dir += 1
+            self.reiniciar_round("dir")
+            ponto = "dir"
+        elif bola.left > LARGURA:
+            self.placar_esq += 1
+            self.reiniciar_round("esq")
+            ponto = "esq"
+
+        return col_esq, col_dir, ponto
+
+    def reset_placar(self):
+        self.placar_dir = 0
+        self.placar_esq = 0
+        self.reiniciar_round("dir")
@@ -0,0 +1,86 @@
+"""
+Co-evolução simultânea: IA_1 e IA_2 avançam juntas a cada geração.
+
+Em vez de treinar um lado contra o campeão congelado do outro, as duas
+populações jogam entre si: cada geração monta `partidas_por_genoma`
+rodadas de pareamentos (IA_1 à esquerda × IA_2 à direita), todas as
+partidas vão num único lote para o pool e cada partida dá a fitness dos
+dois genomas de uma vez. A fitness de um genoma é a média das suas
+partidas.
+
+As populações continuam rodando pelo pop.run do neat (uma geração por
+chamada): o lado esquerdo avalia o lote inteiro e guarda a fitness do
+direito, que só a atribui na sua vez.
+
+    av = AvaliadorSimultaneo(pop_esq, pop_dir, jogar_lote)
+    pop_esq.run(av.avaliar_esq, 1)
+    pop_dir.run(av.avaliar_dir, 1)
+"""
+import random
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+def agendar_partidas(chaves_esq: Sequence[int], chaves_dir: Sequence[int],
+                     partidas_por_genoma: int, rng: random.Random) -> List[Tuple[int, int, int]]:
+    """
+    [(chave esq, chave dir, rodada)]: em cada rodada os dois lados são
+    embaralhados e pareados em ordem. Com populações de tamanhos
+    diferentes a menor dá a volta, então todo genoma joga pelo menos
+    partidas_por_genoma vezes.
+    """
+    partidas = []
+    n = max(len(chaves_esq), len(chaves_dir))
+    for rodada in range(partidas_por_genoma):
+        esq = rng.sample(list(chaves_esq), len(chaves_esq))
+        dir_ = rng.sample(list(chaves_dir), len(chaves_dir))
+        partidas.extend((esq[i % len(esq)], dir_[i % len(dir_)], rodada) for i in range(n))
+    return partidas
+
+
+def medias(partidas: Sequence[Tuple[int, int, int]], valores: Sequence[float]
+           ) -> Tuple[Dict[int, float], Dict[int, float]]:
+    """Fitness média de cada genoma (esq, dir); valores = [f_esq, f_dir] por partida."""
+    soma_esq, soma_dir, n_esq, n_dir = {}, {}, {}, {}
+    for i, (k_esq, k_dir, _) in enumerate(partidas):
+        soma_esq[k_esq] = soma_esq.get(k_esq, 0.0) + valores[2 * i]
+        n_esq[k_esq] = n_esq.get(k_esq, 0) + 1
+        soma_dir[k_dir] = soma_dir.get(k_dir, 0.0) + valores[2 * i + 1]
+        n_dir[k_dir] = n_dir.get(k_dir, 0) + 1
+    return ({k: s / n_esq[k] for k, s in soma_esq.items()},
+            {k: s / n_dir[k] for k, s in soma_dir.items()})
+
+
+class AvaliadorSimultaneo:
+    """
+    Avalia pop_esq e pop_dir com as mesmas partidas.
+
+    jogar_lote(itens, config, geracao) recebe [(genoma esq, genoma dir,
+    rodada)] e devolve as fitness em sequência plana [esq, dir, esq, ...]
+    (ex.: AvaliadorPersistente.mapear com por_item=2).
+    As sementes do agendamento e das partidas vêm da geração de pop_esq.
+    """
+
+    def __init__(self, pop_esq, pop_dir, jogar_lote: Callable, partidas_por_genoma: int = 4):
+        self.pop_esq = pop_esq
+        self.pop_dir = pop_dir
+        self.jogar_lote = jogar_lote
+        self.partidas_por_genoma = partidas_por_genoma
+        self.partidas = 0  # partidas jogadas na última geração
+        self._fitness_dir: Dict[int, float] = {}
+
+    def avaliar_esq(self, genomes, config):
+        geracao = self.pop_esq.generation
+        esq = dict(genomes)
+        dir_ = self.pop_dir.population
+        partidas = agendar_partidas(sorted(esq), sorted(dir_), self.partidas_por_genoma,
+                                    random.Random(f"agenda:{geracao}"))
+        itens = [(esq[k_esq], dir_[k_dir], rodada) for k_esq, k_dir, rodada in partidas]
+        fitness_esq, self._fitness_dir = medias(partidas, self.jogar_lote(itens, config, geracao))
+        self.partidas = len(partidas)
+        for k, g in genomes:
+            g.fitness = fitness_esq[k]
+
+    def avaliar_dir(self, genomes, config):
+        # as partidas já foram jogadas em avaliar_esq, na mesma geração
+        for k, g in genomes:
+            g.fitness = self._fitness_dir[k]
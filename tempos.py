@@ -0,0 +1,130 @@
+"""
+Tempos por geração do treino NEAT, em formato legível por máquina.
+
+ReporterTempos mede, a cada geração de pop.run:
+  - segundos_total: do início da geração até o fim da especiação
+  - segundos_avaliacao: a função de fitness (start_generation → post_evaluate)
+  - segundos_reproducao: reprodução + especiação (post_evaluate → end_generation)
+  - genomas_por_s: população / segundos_avaliacao
+  - utilizacao_workers: do AvaliadorPersistente, se houver (None = sequencial)
+
+Cada registro vai para uma lista em memória (ex.: TEMPOS_GERACOES) e é
+acrescentado a um arquivo .jsonl ou .csv (pela extensão), uma linha por
+geração, para acompanhar a vazão ao longo de uma co-evolução longa.
+"""
+import os
+import csv
+import json
+import time
+from typing import Optional
+
+from neat.reporting import BaseReporter
+
+CAMPOS = ("rotulo", "rodada", "geracao", "inicio", "genomas", "genomas_avaliados",
+          "segundos_total", "segundos_avaliacao", "segundos_reproducao",
+          "genomas_por_s", "utilizacao_workers")
+
+
+class ReporterTempos(BaseReporter):
+    """
+    rotulo/rodada: identificam a execução (ex.: arquivo de saída do lado
+    treinado e rodada da co-evolução) em cada registro.
+    destino: lista onde os registros são acrescentados (None = nova lista).
+    arquivo: .jsonl ou .csv acrescentado a cada geração (None = só memória).
+    avaliador: AvaliadorPersistente cujos relatórios dão os genomas
+    realmente avaliados (cache) e a utilização dos workers.
+    """
+
+    def __init__(self, rotulo: str = "", rodada: Optional[int] = None, destino: Optional[list] = None,
+                 arquivo: Optional[str] = None, avaliador=None):
+        self.rotulo = rotulo
+        self.rodada = rodada
+        self.registros = destino if destino is not None else []
+        self.arquivo = arquivo
+        self.avaliador = avaliador
+        self._geracao = 0
+        self._inicio = None
+        self._fim_avaliacao = None
+        self._n_relatorios = 0
+        self._atual = None
+
+    def start_generation(self, generation):
+        self._geracao = generation
+        self._inicio = time.perf_counter()
+        self._fim_avaliacao = None
+        self._atual = None
+        if self.avaliador is not None:
+            self._n_relatorios = len(self.avaliador.relatorios)
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self._fim_avaliacao = time.perf_counter()
+        avaliacao = self._fim_avaliacao - self._inicio
+        self._atual = {
+            "rotulo": self.rotulo,
+            "rodada": self.rodada,
+            "geracao": self._geracao,
+            "inicio": time.time() - avaliacao,
+            "genomas": len(population),
+            "genomas_avaliados": None,
+            "segundos_total": None,
+            "segundos_avaliacao": avaliacao,
+            "segundos_reproducao": None,
+            "genomas_por_s": len(population) / avaliacao if avaliacao > 0 else 0.0,
+            "utilizacao_workers": None,
+        }
+        if self.avaliador is not None:
+            # a corrida chama o avaliador várias vezes na mesma geração
+            novos = self.avaliador.relatorios[self._n_relatorios:]
+            if novos:
+                ocupado = sum(r["segundos_workers"] for r in novos)
+                self._atual["genomas_avaliados"] = sum(r["genomas"] for r in novos)
+                self._atual["utilizacao_workers"] = ocupado / (self.avaliador.num_workers * avaliacao)
+
+    def end_generation(self, config, population, species_set):
+        if self._atual is None:
+            return
+        agora = time.perf_counter()
+        self._atual["segundos_reproducao"] = agora - self._fim_avaliacao
+        self._atual["segundos_total"] = agora - self._inicio
+        self._registrar()
+
+    def found_solution(self, config, generation, best):
+        # pop.run sai do laço sem reprodução nem end_generation
+        if self._atual is not None:
+            self._atual["segundos_reproducao"] = 0.0
+            self._atual["segundos_total"] = time.perf_counter() - self._inicio
+            self._registrar()
+
+    def _registrar(self):
+        registro, self._atual = self._atual, None
+        self.registros.append(registro)
+        if self.arquivo is not None:
+            acrescentar_registro(self.arquivo, registro)
+
+
+def acrescentar_registro(arquivo: str, registro: dict):
+    """Acrescenta uma linha ao .csv (com cabeçalho se novo) ou ao .jsonl."""
+    if arquivo.endswith(".csv"):
+        novo = not os.path.exists(arquivo) or os.path.getsize(arquivo) == 0
+        with open(arquivo, "a", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=CAMPOS)
+            if novo:
+                escritor.writeheader()
+            escritor.writerow(registro)
+    else:
+        with open(arquivo, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+
+def resumo_tempos(registros: list) -> str:
+    """Uma linha com totais e médias de uma lista de registros."""
+    if not registros:
+        return "Tempos: nenhuma geração registrada"
+    total = sum(r["segundos_total"] for r in registros)
+    avaliacao = sum(r["segundos_avaliacao"] for r in registros)
+    reproducao = sum(r["segundos_reproducao"] for r in registros)
+    genomas = sum(r["genomas"] for r in registros)
+    total = max(total, 1e-9)
+    return (f"Tempos: {len(registros)} gerações em {total:.1f}s "
+            f"(avaliação {100 * avaliacao / total:.0f}%, reprodução {100 * reproducao / total:.0f}%), "
+            f"{genomas / avaliacao if avaliacao > 0 else 0.0:.1f} genomas/s")
@@ -0,0 +1,70 @@
+"""
+RedesLote tem que escolher exatamente a mesma ação que
+neat.nn.FeedForwardNetwork (argmax das saídas, primeiro índice no empate),
+inclusive com as saídas saturadas em ±1.
+"""
+
+import os
+import random
+import sys
+
+import neat
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lote  # noqa: E402
+
+
+def _config():
+    return neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                              neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                              os.path.join(RAIZ, "config-neat.txt"))
+
+
+def _genomas(config, n, mutacoes, semente):
+    random.seed(semente)
+    genomas = []
+    for chave in range(n):
+        g = config.genome_type(chave)
+        g.configure_new(config.genome_config)
+        for _ in range(mutacoes):
+            g.mutate(config.genome_config)
+        genomas.append(g)
+    return genomas
+
+
+def _acoes_neat(redes, entradas):
+    acoes = []
+    for rede, x in zip(redes, entradas):
+        saidas = rede.activate(x.tolist())
+        acoes.append(saidas.index(max(saidas)) - 1)
+    return np.array(acoes)
+
+
+def test_acoes_iguais_a_feedforward():
+    config = _config()
+    rng = np.random.default_rng(0)
+    for semente, mutacoes in enumerate((0, 5, 20, 50)):
+        genomas = _genomas(config, 40, mutacoes, semente)
+        redes = [neat.nn.FeedForwardNetwork.create(g, config) for g in genomas]
+        em_lote = lote.RedesLote(redes)
+        n_in = em_lote.n_in
+        for _ in range(100):
+            # escalas de 0.1 a 100 por linha: cobre a faixa quase saturada,
+            # onde só math.tanh decide entre 0.9999999999999999 e 1.0
+            escala = 10.0 ** rng.uniform(-1.0, 2.0, (len(redes), 1))
+            entradas = rng.normal(0.0, 1.0, (len(redes), n_in)) * escala
+            np.testing.assert_array_equal(em_lote.acoes(entradas),
+                                          _acoes_neat(redes, entradas))
+
+
+def test_saidas_bit_identicas():
+    config = _config()
+    genomas = _genomas(config, 30, 30, 99)
+    redes = [neat.nn.FeedForwardNetwork.create(g, config) for g in genomas]
+    em_lote = lote.RedesLote(redes)
+    entradas = np.random.default_rng(1).normal(0.0, 2.0, (len(redes), em_lote.n_in))
+    esperado = np.array([rede.activate(x.tolist()) for rede, x in zip(redes, entradas)])
+    np.testing.assert_array_equal(em_lote.ativar(entradas), esperado)
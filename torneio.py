@@ -0,0 +1,265 @@
+"""
+Torneio headless entre campeões salvos, com Elo e taxa de vitória.
+
+Cada par de jogadores se enfrenta dos dois lados, com saques sorteados
+por sementes fixas (mesmo resultado em qualquer máquina e número de
+workers), na física de simulacao.JogoPongSim (a mesma de JogoPong, sem
+pygame). Uma partida vai até `pontos` pontos ou `max_segundos` de jogo.
+
+Jogadores: os .pkl/.rede de um diretório (um .pkl com .rede atualizado
+ao lado é lido do .rede) e, com --hall, cada campeão dos .hof.
+
+As redes vão uma vez para cada worker (broadcast do
+AvaliadorPersistente) e são compiladas na primeira partida em que
+aparecem; as tarefas levam só os índices dos jogadores. O calendário é
+o round-robin por rodadas (método do círculo), e o Elo é atualizado
+partida a partida nessa ordem.
+
+Uso:
+    python torneio.py campeoes/                      # salva torneio.json
+    python torneio.py campeoes/ --saida t.json --workers 4 --pontos 5
+"""
+import os
+import sys
+import json
+import glob
+import random
+import argparse
+import multiprocessing
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+import neat
+
+from hall_da_fama import HallDaFama
+from paralelo import AvaliadorPersistente
+from pong_neat import ctrl_por_rede
+from redes import carregar_rede, carregar_rede_salva, rede_de_bytes, rede_para_bytes
+from simulacao import FPS, JogoPongSim
+
+CAMINHO_CONFIG = os.path.join(os.path.dirname(__file__), "config-neat.txt")
+ELO_INICIAL = 1500.0
+
+
+# ==========================
+# JOGADORES
+# ==========================
+def carregar_jogadores(diretorio: str, config=None, hall=False) -> List[Tuple[str, bytes]]:
+    """[(nome, rede em bytes .rede)] dos genomas em `diretorio`, por nome."""
+    jogadores = {}
+    for caminho in sorted(glob.glob(os.path.join(diretorio, "*.pkl"))):
+        try:
+            rede = carregar_rede_salva(caminho, config, compilada=False)
+        except Exception as e:
+            print(f"⚠ {os.path.basename(caminho)} ignorado: {e}")
+            continue
+        jogadores[os.path.basename(caminho)] = rede_para_bytes(rede)
+    for caminho in sorted(glob.glob(os.path.join(diretorio, "*.rede"))):
+        pkl = os.path.splitext(caminho)[0] + ".pkl"
+        if os.path.basename(pkl) not in jogadores:
+            jogadores[os.path.basename(caminho)] = rede_para_bytes(carregar_rede(caminho, compilada=False))
+    if hall:
+        for caminho in sorted(glob.glob(os.path.join(diretorio, "*.hof"))):
+            for id_, rede in HallDaFama(caminho).redes():
+                jogadores[f"{os.path.basename(caminho)}#{id_}"] = rede
+    return sorted(jogadores.items())
+
+
+# ==========================
+# CALENDÁRIO
+# ==========================
+def calendario(n: int) -> List[List[Tuple[int, int]]]:
+    """
+    Rodadas do round-robin (método do círculo): cada jogador aparece no
+    máximo uma vez por rodada e todo par se encontra exatamente uma vez.
+    """
+    indices = list(range(n)) + ([None] if n % 2 else [])
+    m = len(indices)
+    rodadas = []
+    for _ in range(m - 1):
+        pares = [(indices[k], indices[m - 1 - k]) for k in range(m // 2)]
+        rodadas.append([(min(a, b), max(a, b)) for a, b in pares if a is not None and b is not None])
+        indices = [indices[0], indices[-1]] + indices[1:-1]
+    return rodadas
+
+
+def partidas_do_par(a: int, b: int, saques_por_lado: int) -> List[Tuple[int, int, int]]:
+    """(esq, dir, saque) de um par: os dois lados, saques alternados."""
+    return [(esq, dir_, s) for esq, dir_ in ((a, b), (b, a)) for s in range(saques_por_lado)]
+
+
+# ==========================
+# PARTIDA (WORKER)
+# ==========================
+_TORNEIO = {"nomes": [], "redes": [], "compiladas": {}, "pontos": 3, "max_passos": 1800}
+
+
+def receber_torneio(config, dados: dict):
+    """Jogadores e regras do torneio neste processo (preparar do broadcast)."""
+    _TORNEIO.update(dados)
+    _TORNEIO["compiladas"] = {}
+
+
+def _rede(i: int):
+    rede = _TORNEIO["compiladas"].get(i)
+    if rede is None:
+        rede = _TORNEIO["compiladas"][i] = rede_de_bytes(_TORNEIO["redes"][i])
+    return rede
+
+
+def jogar_partida(rede_esq, rede_dir, rng: random.Random, serve_para: str, pontos: int,
+                  max_passos: int) -> Tuple[int, int]:
+    """Placar (esq, dir) ao chegar a `pontos` ou a max_passos de 1/FPS."""
+    jogo = JogoPongSim(rng)
+    jogo.reset_placar()
+    jogo.reiniciar_round(serve_para)
+    ctrl_esq = ctrl_por_rede(rede_esq, lado="esq")
+    ctrl_dir = ctrl_por_rede(rede_dir, lado="dir")
+    dt = 1.0 / FPS
+    for _ in range(max_passos):
+        if jogo.step(dt, ctrl_esq, ctrl_dir)[2] is not None and \
+                max(jogo.placar_esq, jogo.placar_dir) >= pontos:
+            break
+    return jogo.placar_esq, jogo.placar_dir
+
+
+def partida_torneio(partida, config=None, geracao=0):
+    """Placar de (esq, dir, saque) entre jogadores publicados por receber_torneio."""
+    esq, dir_, saque = partida
+    nomes = _TORNEIO["nomes"]
+    rng = random.Random(f"torneio:{nomes[esq]}:{nomes[dir_]}:{saque}")
+    return jogar_partida(_rede(esq), _rede(dir_), rng, "dir" if saque % 2 == 0 else "esq",
+                         _TORNEIO["pontos"], _TORNEIO["max_passos"])
+
+
+# ==========================
+# ELO E TABELAS
+# ==========================
+def esperado(ra: float, rb: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0))
+
+
+def classificar(nomes: Sequence[str], partidas: Sequence[Tuple[int, int, int]],
+                placares: Sequence[float], k_elo: float = 16.0) -> dict:
+    """
+    Elo (atualizado na ordem das partidas), vitórias/empates/derrotas,
+    pontos e taxa de vitória por jogador e por confronto.
+    placares: [pontos esq, pontos dir] de cada partida, em sequência.
+    """
+    n = len(nomes)
+    elo = [ELO_INICIAL] * n
+    stats = [{"partidas": 0, "vitorias": 0, "empates": 0, "derrotas": 0,
+              "pontos_pro": 0, "pontos_contra": 0} for _ in range(n)]
+    confronto = [{} for _ in range(n)]  # confronto[a][b] = [resultado de a somado, partidas]
+    for idx, (esq, dir_, _) in enumerate(partidas):
+        pe, pd = int(placares[2 * idx]), int(placares[2 * idx + 1])
+        resultado = 1.0 if pe > pd else 0.0 if pe < pd else 0.5
+        delta = k_elo * (resultado - esperado(elo[esq], elo[dir_]))
+        elo[esq] += delta
+        elo[dir_] -= delta
+        for jog, pro, contra, r in ((esq, pe, pd, resultado), (dir_, pd, pe, 1.0 - resultado)):
+            s = stats[jog]
+            s["partidas"] += 1
+            s["vitorias"] += r == 1.0
+            s["empates"] += r == 0.5
+            s["derrotas"] += r == 0.0
+            s["pontos_pro"] += pro
+            s["pontos_contra"] += contra
+        for a, b, r in ((esq, dir_, resultado), (dir_, esq, 1.0 - resultado)):
+            c = confronto[a].setdefault(b, [0.0, 0])
+            c[0] += r
+            c[1] += 1
+
+    jogadores = []
+    for i in sorted(range(n), key=lambda i: -elo[i]):
+        s = stats[i]
+        jogadores.append(dict(nome=nomes[i], elo=round(elo[i], 1), **s,
+                              taxa_vitoria=(s["vitorias"] + 0.5 * s["empates"]) / s["partidas"]
+                              if s["partidas"] else 0.0))
+    return {
+        "jogadores": jogadores,
+        # confrontos[a][b]: pontuação média de a contra b (vitória 1, empate 0.5)
+        "confrontos": {nomes[a]: {nomes[b]: c[0] / c[1] for b, c in sorted(confronto[a].items())}
+                       for a in range(n)},
+    }
+
+
+# ==========================
+# TORNEIO
+# ==========================
+def rodar_torneio(jogadores: Sequence[Tuple[str, bytes]], num_workers: Optional[int] = None,
+                  pontos=3, max_segundos=30.0, saques_por_lado=2, k_elo=16.0) -> dict:
+    """Joga o round-robin completo e devolve o relatório (ver classificar)."""
+    nomes = [nome for nome, _ in jogadores]
+    dados = {"nomes": nomes, "redes": [rede for _, rede in jogadores],
+             "pontos": pontos, "max_passos": int(round(max_segundos * FPS))}
+    partidas = [p for rodada in calendario(len(nomes)) for a, b in rodada
+                for p in partidas_do_par(a, b, saques_por_lado)]
+    print(f"🏓 {len(nomes)} jogadores, {len(partidas)} partidas")
+
+    num_workers = num_workers or multiprocessing.cpu_count()
+    if num_workers > 1 and len(partidas) > 1:
+        with AvaliadorPersistente(num_workers, partida_torneio, verboso=False) as av:
+            av.publicar(None, preparar=receber_torneio, extra=dados)
+            placares = av.mapear(None, partidas, None, por_item=2)
+            relatorio_pool = av.relatorios[-1]
+        print(f"   ⚙ {relatorio_pool['segundos']:.1f}s, {relatorio_pool['genomas_por_s']:.1f} partidas/s, "
+              f"uso {100 * relatorio_pool['utilizacao']:.0f}% de {num_workers} workers")
+    else:
+        receber_torneio(None, dados)
+        placares = [p for partida in partidas for p in partida_torneio(partida)]
+
+    relatorio = classificar(nomes, partidas, placares, k_elo)
+    relatorio.update(data=datetime.now().isoformat(timespec="seconds"),
+                     regras={"pontos": pontos, "max_segundos": max_segundos,
+                             "saques_por_lado": saques_por_lado, "k_elo": k_elo},
+                     partidas=len(partidas))
+    return relatorio
+
+
+def imprimir(relatorio: dict, limite: int = 30):
+    print(f"\n{'='*72}")
+    print(f"{'#':>3}  {'jogador':<32} {'elo':>7} {'V':>5} {'E':>5} {'D':>5} {'taxa':>7}")
+    print(f"{'='*72}")
+    for pos, j in enumerate(relatorio["jogadores"][:limite], start=1):
+        print(f"{pos:>3}  {j['nome'][:32]:<32} {j['elo']:>7.1f} {j['vitorias']:>5} "
+              f"{j['empates']:>5} {j['derrotas']:>5} {100 * j['taxa_vitoria']:>6.1f}%")
+    if len(relatorio["jogadores"]) > limite:
+        print(f"   ... mais {len(relatorio['jogadores']) - limite} jogadores no JSON")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Torneio round-robin entre genomas salvos (Elo)")
+    parser.add_argument("diretorio", help="diretório com os .pkl/.rede dos jogadores")
+    parser.add_argument("--saida", default="torneio.json", help="arquivo JSON do relatório")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: nº de CPUs)")
+    parser.add_argument("--pontos", type=int, default=3, help="pontos para vencer uma partida (padrão 3)")
+    parser.add_argument("--max-segundos", type=float, default=30.0,
+                        help="duração máxima de uma partida em segundos de jogo (padrão 30)")
+    parser.add_argument("--saques", type=int, default=2, help="partidas por lado em cada confronto (padrão 2)")
+    parser.add_argument("--k", type=float, default=16.0, help="fator K do Elo (padrão 16)")
+    parser.add_argument("--hall", action="store_true", help="inclui os campeões dos .hof do diretório")
+    args = parser.parse_args(argv)
+
+    config = neat.config.Config(neat.DefaultGenome,
+                                neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet,
+                                neat.DefaultStagnation,
+                                CAMINHO_CONFIG)
+    jogadores = carregar_jogadores(args.diretorio, config, args.hall)
+    if len(jogadores) < 2:
+        print(f"❌ {args.diretorio}: são necessários pelo menos 2 jogadores")
+        return 1
+
+    relatorio = rodar_torneio(jogadores, args.workers, args.pontos, args.max_segundos,
+                              args.saques, args.k)
+    imprimir(relatorio)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Relatório salvo em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())